@@ -8,9 +8,9 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def get_ai_service():
-    """获取配置的AI服务实例"""
-    provider = settings.AI_PROVIDER.lower()
+def create_ai_service(provider: str):
+    """创建指定服务商的AI服务实例"""
+    provider = provider.lower()
 
     if provider == "zhipu":
         from app.ai.zhipu import ZhipuAIService
@@ -25,4 +25,29 @@ def get_ai_service():
         raise ValueError(f"Unsupported AI provider: {provider}")
 
 
-__all__ = ["get_ai_service"]
+_ai_service = None
+
+
+def get_ai_service():
+    """
+    获取配置的AI服务实例，进程内复用同一实例（及其底层客户端）
+    配置了 AI_FALLBACK_PROVIDER 时返回主备对冲的组合服务
+    """
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = _build_ai_service()
+    return _ai_service
+
+
+def _build_ai_service():
+    primary = create_ai_service(settings.AI_PROVIDER)
+    fallback = settings.AI_FALLBACK_PROVIDER
+    if not fallback or fallback == settings.AI_PROVIDER:
+        return primary
+
+    from app.ai.hedged import HedgedAIService
+    logger.info(f"Using {settings.AI_PROVIDER} with hedged fallback to {fallback}")
+    return HedgedAIService(primary, create_ai_service(fallback))
+
+
+__all__ = ["get_ai_service", "create_ai_service"]
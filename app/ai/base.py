@@ -2,10 +2,106 @@
 AI服务基类
 定义AI服务的通用接口
 """
+import asyncio
+import json
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
+from app.ai.cache import get_llm_cache
+from app.ai.limiter import get_adaptive_limiter, get_retry_budget
+from app.ai.prompts import COMMON_PROMPTS
+from app.config import settings
 from app.models.article import Article, AIAnalysisResult
+from app.utils.logger import get_logger
+from app.utils.rate_limiter import compute_backoff
+
+logger = get_logger(__name__)
+
+_CJK_RE = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+# 服务商 -> 执行阻塞SDK调用的专用线程池
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+# 视为服务端过载、可以重试的HTTP状态码
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CallTimer:
+    """统计一次调用中实际请求服务商接口的耗时，不含响应缓存命中和并发排队的时间"""
+
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.elapsed = 0.0
+        self._since = 0.0
+
+    def start(self) -> float:
+        now = time.monotonic()
+        if not self.active:
+            self._since = now
+        self.active += 1
+        return now
+
+    def stop(self, started: float):
+        self.active -= 1
+        self.calls += 1
+        self.elapsed += time.monotonic() - started
+
+    def observed(self) -> Optional[float]:
+        """
+        已观测到的接口耗时；请求仍在进行时计入已进行的部分，作为耗时的下限
+        未发出过请求（缓存命中或仍在排队）时返回None
+        """
+        if self.active:
+            return self.elapsed + time.monotonic() - self._since
+        return self.elapsed if self.calls else None
+
+
+# 当前调用链的接口计时器，由对冲服务为主服务的调用设置
+call_timer: ContextVar[Optional[CallTimer]] = ContextVar("ai_call_timer", default=None)
+
+# 单次接口请求的超时（秒），由调用方按场景设置；获得并发名额后才开始计时，排队时间不计入
+request_timeout: ContextVar[Optional[float]] = ContextVar("ai_request_timeout", default=None)
+
+
+class AIServiceError(Exception):
+    """
+    服务商接口调用失败
+    status 为None表示网络错误或超时，未收到服务端响应
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in RETRYABLE_STATUS
+
+
+def get_provider_concurrency(provider: str) -> int:
+    """
+    获取服务商允许的最大并发请求数
+    启用自适应并发时上限提高到 AI_AIMD_MAX_CONCURRENCY，实际并发由限制器在该范围内调整
+    """
+    fixed = settings.AI_PROVIDER_CONCURRENCY.get(provider, settings.AI_MAX_CONCURRENCY)
+    if settings.AI_ADAPTIVE_CONCURRENCY:
+        return max(fixed, settings.AI_AIMD_MAX_CONCURRENCY)
+    return fixed
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数：中日韩字符约1个token，其他字符约4个字符1个token"""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
 
 
 class AIServiceBase(ABC):
@@ -14,6 +110,122 @@ class AIServiceBase(ABC):
     def __init__(self):
         self.name = "base"
 
+    async def _run_blocking(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在服务商专用线程池中执行阻塞的SDK调用，避免阻塞事件循环
+        线程池大小与该服务商的并发上限一致
+        """
+        executor = _executors.get(self.name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=get_provider_concurrency(self.name),
+                thread_name_prefix=f"ai-{self.name}"
+            )
+            _executors[self.name] = executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+    async def _call_api(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        调用大模型接口
+        相同请求优先命中响应缓存，并发中的相同请求只发送一次
+        :param messages: 对话消息
+        :return: 模型返回的文本
+        """
+        cache = get_llm_cache()
+        if cache is None:
+            return await self._complete_with_retry(messages, temperature, max_tokens)
+
+        key = cache.make_key(self.name, getattr(self, "model", ""), messages, temperature, max_tokens)
+        return await cache.get_or_call(
+            key,
+            lambda: self._complete_with_retry(messages, temperature, max_tokens)
+        )
+
+    async def _complete_with_retry(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        经自适应并发限制器请求接口，过载类错误在本次运行的重试预算内带抖动退避重试
+        """
+        if not settings.AI_ADAPTIVE_CONCURRENCY:
+            return await self._complete_once(messages, temperature, max_tokens)
+
+        limiter = get_adaptive_limiter(
+            self.name,
+            getattr(self, "model", ""),
+            get_provider_concurrency(self.name)
+        )
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = await self._complete_once(messages, temperature, max_tokens)
+            except AIServiceError as e:
+                limiter.release(overloaded=e.retryable)
+                if not e.retryable or attempt >= settings.AI_MAX_RETRIES:
+                    raise
+                if not get_retry_budget().try_acquire():
+                    logger.warning(f"LLM retry budget exhausted, giving up: {e}")
+                    raise
+                delay = compute_backoff(
+                    attempt,
+                    base=settings.AI_RETRY_BASE_DELAY,
+                    cap=settings.AI_RETRY_MAX_DELAY
+                )
+                if e.retry_after is not None:
+                    delay = max(delay, min(e.retry_after, settings.AI_RETRY_MAX_DELAY))
+                attempt += 1
+                logger.warning(f"{self.name} request failed ({e}), retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except BaseException:
+                limiter.release()
+                raise
+            else:
+                limiter.release(latency=time.monotonic() - started)
+                return response
+
+    async def _complete_once(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """请求一次服务商接口，超过 request_timeout 时按可重试的错误处理"""
+        timeout = request_timeout.get()
+        timer = call_timer.get()
+        started = timer.start() if timer else None
+        try:
+            return await asyncio.wait_for(self._complete(messages, temperature, max_tokens), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise AIServiceError(f"{self.name} request timed out after {timeout}s")
+        finally:
+            if timer:
+                timer.stop(started)
+
+    @abstractmethod
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        实际请求服务商接口，由各服务商实现
+        :param messages: 对话消息
+        :return: 模型返回的文本
+        """
+        pass
+
     @abstractmethod
     async def analyze_article(self, article: Article) -> AIAnalysisResult:
         """
@@ -63,3 +275,110 @@ class AIServiceBase(ABC):
 来源: {article.source}
 内容: {article.content or article.url}
 """
+
+    def _extract_json(self, response: str) -> Any:
+        """从模型返回中提取JSON，兼容 ```json 代码块"""
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0]
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0]
+        return json.loads(response.strip())
+
+    def pack_articles(
+        self,
+        articles: List[Article],
+        token_budget: Optional[int] = None,
+        max_articles: Optional[int] = None
+    ) -> List[List[Article]]:
+        """
+        按token预算把文章装入批次，单篇超出预算时独占一批
+        :param token_budget: 每批输入token上限，默认 AI_BATCH_TOKEN_BUDGET
+        :param max_articles: 每批最多文章数，默认 AI_BATCH_MAX_ARTICLES
+        """
+        token_budget = token_budget or settings.AI_BATCH_TOKEN_BUDGET
+        max_articles = max_articles or settings.AI_BATCH_MAX_ARTICLES
+        overhead = estimate_tokens(COMMON_PROMPTS["analyze_articles_batch"])
+
+        batches: List[List[Article]] = []
+        current: List[Article] = []
+        used = overhead
+        for article in articles:
+            cost = estimate_tokens(self._build_article_context(article)) + 5
+            if current and (used + cost > token_budget or len(current) >= max_articles):
+                batches.append(current)
+                current, used = [], overhead
+            current.append(article)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def analyze_batch(self, articles: List[Article]) -> List[AIAnalysisResult]:
+        """
+        一次请求分析多篇文章，结果与输入顺序一致
+        模型遗漏或返回格式错误的条目单独调用 analyze_article 补齐
+        """
+        if len(articles) == 1:
+            return [await self.analyze_article(articles[0])]
+
+        parsed: Dict[int, AIAnalysisResult] = {}
+        try:
+            articles_context = "\n".join(
+                f"[文章 {i + 1}]{self._build_article_context(article)}"
+                for i, article in enumerate(articles)
+            )
+            prompt = COMMON_PROMPTS["analyze_articles_batch"].format(
+                articles=articles_context,
+                count=len(articles)
+            )
+            messages = [
+                {"role": "system", "content": "你是一个专业的科技资讯分析师。"},
+                {"role": "user", "content": prompt}
+            ]
+            response = await self._call_api(
+                messages,
+                temperature=0.3,
+                max_tokens=min(200 * len(articles) + 200, 4000)
+            )
+            parsed = self._parse_batch_response(response, len(articles))
+        except Exception as e:
+            logger.error(f"Error analyzing batch of {len(articles)} articles: {e}")
+
+        missing = [i for i in range(len(articles)) if i not in parsed]
+        if missing:
+            logger.warning(f"Batch analysis missed {len(missing)}/{len(articles)} articles, falling back")
+            fallbacks = await asyncio.gather(*[self.analyze_article(articles[i]) for i in missing])
+            parsed.update(zip(missing, fallbacks))
+
+        return [parsed[i] for i in range(len(articles))]
+
+    def _parse_batch_response(self, response: str, count: int) -> Dict[int, AIAnalysisResult]:
+        """解析批量分析返回的JSON数组，返回 下标 -> 结果，无法解析的条目跳过"""
+        try:
+            items = self._extract_json(response)
+        except (json.JSONDecodeError, IndexError):
+            return {}
+        if isinstance(items, dict):
+            items = items.get("results") or items.get("articles") or []
+        if not isinstance(items, list):
+            return {}
+
+        results: Dict[int, AIAnalysisResult] = {}
+        for position, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get("summary"):
+                continue
+            try:
+                index = int(item["id"]) - 1 if "id" in item else position
+                if not 0 <= index < count or index in results:
+                    continue
+                keywords = item.get("keywords") or []
+                results[index] = AIAnalysisResult(
+                    summary=str(item["summary"]),
+                    keywords=[str(k) for k in keywords] if isinstance(keywords, list) else [],
+                    category=item.get("category"),
+                    sentiment=item.get("sentiment"),
+                    score=min(max(float(item.get("score", 0.5)), 0.0), 1.0)
+                )
+            except (TypeError, ValueError):
+                continue
+        return results
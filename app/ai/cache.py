@@ -0,0 +1,115 @@
+"""
+大模型响应缓存
+按 服务商/模型/消息/参数 的哈希缓存响应，并合并并发中的相同请求
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.utils.disk_cache import DiskCache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMResponseCache:
+    """内容寻址的大模型响应缓存"""
+
+    def __init__(self):
+        self.store = DiskCache(
+            "llm",
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl=settings.LLM_CACHE_TTL
+        )
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """计算请求的缓存键"""
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get_or_call(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        """
+        命中缓存直接返回；相同请求正在进行时等待其结果；否则发起请求并缓存
+        失败的请求不缓存
+        """
+        cached = self.store.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        while key in self._inflight:
+            inflight = self._inflight[key]
+            try:
+                result = await asyncio.shield(inflight)
+                self.coalesced += 1
+                return result
+            except asyncio.CancelledError:
+                # 发起请求的协程被取消时重新竞争，自身被取消则向上抛出
+                if not inflight.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            self.store.set(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计"""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / total, 3) if total else 0.0,
+        }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """获取进程内共享的响应缓存，未启用时返回None"""
+    global _llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
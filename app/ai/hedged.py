@@ -0,0 +1,168 @@
+"""
+对冲请求的组合AI服务
+请求先发给主服务，超过主服务近期延迟分位数仍未返回时向备用服务发出对冲请求，
+先返回有效结果的一方胜出，另一方被取消；主服务出错或返回空结果时直接切换到备用服务
+"""
+import asyncio
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Optional, Tuple
+
+from app.ai.base import AIServiceBase, CallTimer, call_timer
+from app.config import settings
+from app.models.article import Article, AIAnalysisResult
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 每种方法保留的主服务接口延迟样本数（不含缓存命中和排队时间）
+LATENCY_WINDOW = 200
+# 样本数不足时使用 AI_HEDGE_DELAY
+MIN_LATENCY_SAMPLES = 20
+
+
+async def _timed(timer: CallTimer, coro: Coroutine[Any, Any, Any]) -> Any:
+    """在独立的任务上下文中为调用链设置接口计时器"""
+    call_timer.set(timer)
+    return await coro
+
+
+def _task_outcome(task: asyncio.Future, is_valid: Callable[[Any], bool]) -> Tuple[bool, Any, Optional[BaseException]]:
+    """返回 (结果是否有效, 结果, 异常)"""
+    error = task.exception()
+    result = None if error else task.result()
+    return error is None and is_valid(result), result, error
+
+
+class HedgedAIService(AIServiceBase):
+    """主备两个服务商组合，对冲慢请求并在故障时切换"""
+
+    def __init__(self, primary: AIServiceBase, secondary: AIServiceBase):
+        super().__init__()
+        self.primary = primary
+        self.secondary = secondary
+        # 并发配置和日志沿用主服务
+        self.name = primary.name
+        self.model = getattr(primary, "model", "")
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.stats = {"primary": 0, "hedged": 0, "failover": 0}
+
+    def hedge_delay(self, method: str) -> float:
+        """主服务该方法近期延迟的分位数，样本不足时使用配置的固定值"""
+        samples = self.latencies.get(method)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return settings.AI_HEDGE_DELAY
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * settings.AI_HEDGE_PERCENTILE / 100))
+        return ordered[index]
+
+    def _record_latency(self, method: str, timer: CallTimer):
+        """记录主服务实际请求接口的耗时；缓存命中或仍在排队（未发出请求）时不记录"""
+        latency = timer.observed()
+        if latency is not None:
+            self.latencies.setdefault(method, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def _start_secondary(self, method: str, outcome: str, tasks: Dict[asyncio.Future, str], args, kwargs):
+        if outcome == "hedged":
+            logger.info(f"{self.primary.name}.{method} slower than {self.hedge_delay(method):.1f}s, hedging")
+        secondary = asyncio.ensure_future(getattr(self.secondary, method)(*args, **kwargs))
+        tasks[secondary] = "secondary"
+
+    async def _hedge(
+        self,
+        method: str,
+        *args,
+        is_valid: Callable[[Any], bool] = lambda result: True,
+        **kwargs
+    ) -> Any:
+        """
+        以对冲方式调用主备服务的同名方法
+        两个服务都失败时返回主服务的结果，或抛出主服务的异常
+        """
+        timer = CallTimer()
+        primary = asyncio.ensure_future(_timed(timer, getattr(self.primary, method)(*args, **kwargs)))
+        tasks = {primary: "primary"}
+        outcome: Optional[str] = None
+        fallback: Tuple[Any, Optional[BaseException]] = (None, None)
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(method))
+            while True:
+                for task in done:
+                    role = tasks.pop(task)
+                    valid, result, error = _task_outcome(task, is_valid)
+                    if valid:
+                        if role == "primary" or primary in tasks:
+                            # 主服务落败时以已进行的请求时间作为其延迟的下限，
+                            # 否则分位数只来自比备用服务快的请求，会越来越低
+                            self._record_latency(method, timer)
+                        self.stats[outcome or "primary"] += 1
+                        return result
+                    if role == "primary":
+                        fallback = (result, error)
+                        logger.warning(
+                            f"{self.primary.name}.{method} failed ({error or 'empty result'}), "
+                            f"failing over to {self.secondary.name}"
+                        )
+
+                if outcome is None:
+                    # 超过对冲延迟，或主服务已失败
+                    outcome = "hedged" if primary in tasks else "failover"
+                    self._start_secondary(method, outcome, tasks, args, kwargs)
+
+                if not tasks:
+                    break
+                done, _ = await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        result, error = fallback
+        if error is not None:
+            raise error
+        return result
+
+    async def _call_api(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """对冲调用两个服务商的接口，各自经过响应缓存与并发限制"""
+        return await self._hedge("_call_api", messages, temperature, max_tokens, is_valid=bool)
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        return await self._call_api(messages, temperature, max_tokens)
+
+    async def analyze_article(self, article: Article) -> AIAnalysisResult:
+        """分析单篇文章，服务商失败时返回的空摘要视为无效结果"""
+        return await self._hedge(
+            "analyze_article",
+            article,
+            is_valid=lambda result: bool(result.summary)
+        )
+
+    async def summarize_articles(
+        self,
+        articles: List[Article],
+        max_summary_length: int = 500
+    ) -> Dict[str, Any]:
+        """批量总结文章"""
+        return await self._hedge(
+            "summarize_articles",
+            articles,
+            max_summary_length,
+            is_valid=lambda result: bool(result.get("summary")) and result["summary"] != "无法生成摘要"
+        )
+
+    async def extract_keywords(self, text: str, max_keywords: int = 10) -> List[str]:
+        """提取关键词"""
+        return await self._hedge("extract_keywords", text, max_keywords, is_valid=bool)
+
+    async def categorize_article(self, article: Article) -> str:
+        """对文章进行分类"""
+        return await self._hedge("categorize_article", article)
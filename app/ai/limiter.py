@@ -0,0 +1,128 @@
+"""
+大模型调用的自适应并发控制与重试
+AIMD：延迟和错误率正常时并发数加性增长，遇到429/5xx或延迟突增时减半
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdaptiveLimiter:
+    """单个 服务商/模型 的AIMD并发限制器"""
+
+    def __init__(self, name: str, max_limit: int):
+        self.name = name
+        self.min_limit = min(settings.AI_AIMD_MIN_CONCURRENCY, max_limit)
+        self.max_limit = max_limit
+        self.limit = float(min(max(settings.AI_AIMD_INITIAL_CONCURRENCY, self.min_limit), max_limit))
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.samples = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self):
+        """获取一个并发名额，超出当前限制时排队等待"""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                raise
+        self.in_flight += 1
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False):
+        """
+        归还名额并根据本次结果调整并发限制
+        :param latency: 成功请求的耗时，失败或取消时为None
+        :param overloaded: 是否为过载信号（429/5xx/超时）
+        """
+        self.in_flight -= 1
+        if overloaded:
+            self._decrease("overload")
+        elif latency is not None:
+            self._on_success(latency)
+        self._wake()
+
+    def _on_success(self, latency: float):
+        threshold = settings.AI_AIMD_LATENCY_FACTOR * self.latency_ewma if self.latency_ewma else None
+        if threshold and self.samples >= 5 and latency > threshold:
+            self._decrease(f"latency spike {latency:.1f}s")
+        else:
+            # 每个窗口（约 limit 个请求）并发数加1
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+        self.samples += 1
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+    def _decrease(self, reason: str):
+        """乘性减小；同一批并发失败在一个延迟窗口内只减半一次"""
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.latency_ewma or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        old_limit = self.limit
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        logger.warning(f"LLM concurrency for {self.name} reduced {old_limit:.1f} -> {self.limit:.1f} ({reason})")
+
+    def _wake(self):
+        available = int(self.limit) - self.in_flight
+        while available > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+
+class RetryBudget:
+    """一次简报运行内所有大模型调用共享的重试次数预算"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.used = 0
+
+    def try_acquire(self) -> bool:
+        if self.used >= self.total:
+            return False
+        self.used += 1
+        return True
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_retry_budget: Optional[RetryBudget] = None
+
+
+def get_adaptive_limiter(provider: str, model: str, max_limit: int) -> AdaptiveLimiter:
+    """获取 服务商/模型 对应的限制器"""
+    key = f"{provider}:{model}"
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveLimiter(key, max_limit)
+        _limiters[key] = limiter
+    return limiter
+
+
+def get_retry_budget() -> RetryBudget:
+    """获取当前运行的重试预算"""
+    global _retry_budget
+    if _retry_budget is None:
+        _retry_budget = RetryBudget(settings.AI_RETRY_BUDGET)
+    return _retry_budget
+
+
+def reset_retry_budget(total: Optional[int] = None):
+    """
+    每次简报运行开始时重置重试预算
+    :param total: 预算次数，默认 AI_RETRY_BUDGET；阶段任务模式下为分给本任务的份额
+    """
+    global _retry_budget
+    _retry_budget = RetryBudget(settings.AI_RETRY_BUDGET if total is None else total)
@@ -4,13 +4,16 @@ OpenRouter AI服务实现
 """
 import json
 from typing import List, Dict, Any
+import asyncio
 import aiohttp
 
-from app.ai.base import AIServiceBase
+from app.ai.base import AIServiceBase, AIServiceError
 from app.ai.prompts import ZHIPU_PROMPTS
 from app.models.article import Article, AIAnalysisResult
 from app.config import settings
+from app.utils.http_client import get_http_session
 from app.utils.logger import get_logger
+from app.utils.rate_limiter import parse_retry_after
 
 logger = get_logger(__name__)
 
@@ -26,7 +29,7 @@ class OpenRouterAIService(AIServiceBase):
         # 默认使用高质量的模型
         self.model = getattr(settings, 'OPENROUTER_MODEL', 'anthropic/claude-3-haiku:beta')
 
-    async def _call_api(
+    async def _complete(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
@@ -48,21 +51,30 @@ class OpenRouterAIService(AIServiceBase):
                 "max_tokens": max_tokens,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"OpenRouter API error: {response.status} - {error_text}")
-                        raise Exception(f"API error: {response.status}")
-
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-
+            session = get_http_session()
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=60)
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"OpenRouter API error: {response.status} - {error_text}")
+                    raise AIServiceError(
+                        f"API error: {response.status}",
+                        status=response.status,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
+
+                data = await response.json()
+                return data["choices"][0]["message"]["content"]
+
+        except AIServiceError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error connecting to OpenRouter API: {e}")
+            raise AIServiceError(str(e) or type(e).__name__) from e
         except Exception as e:
             logger.error(f"Error calling OpenRouter API: {e}")
             raise
@@ -98,3 +98,46 @@ QWEN_PROMPTS = {
 以JSON格式返回。
 """
 }
+
+# 与服务商无关的通用 Prompt模板
+COMMON_PROMPTS = {
+    "analyze_articles_batch": """请逐篇分析以下{count}篇科技文章：
+
+{articles}
+
+请以JSON数组格式返回，数组中每篇文章对应一个对象，id与文章编号一致：
+[
+    {{
+        "id": 1,
+        "summary": "一句话总结文章核心内容（30-50字）",
+        "keywords": ["关键词1", "关键词2", "关键词3"],
+        "category": "文章类别（如：人工智能、移动开发、前端技术、云计算等）",
+        "sentiment": "情感倾向（positive/neutral/negative）",
+        "score": 0.8
+    }}
+]
+
+注意：
+- 每篇文章都必须返回，不要合并或遗漏
+- keywords提取3-5个最重要的技术关键词
+- score范围0-1，表示文章重要性和热度
+- 只返回JSON数组，不要其他内容
+""",
+
+    "reduce_summaries": """以下是今日{count}篇科技文章分成{parts}组后，各组的摘要和热点话题：
+
+{partials}
+
+请合并为今日科技简报，以JSON格式返回：
+{{
+    "summary": "今日科技热点概述（不超过{max_length}字），涵盖主要趋势和重要事件",
+    "trending_topics": ["热点话题1", "热点话题2", "热点话题3"],
+    "category": "主要分类（如：人工智能、云计算等）"
+}}
+
+要求：
+- 综合所有分组，不要只复述某一组
+- 多个分组都出现的话题优先
+- trending_topics提取3-5个今日最热技术话题，按重要性排序
+""",
+}
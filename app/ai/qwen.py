@@ -2,11 +2,12 @@
 通义千问AI服务实现
 """
 import json
+from http import HTTPStatus
 from typing import List, Dict, Any
 import dashscope
 from dashscope import Generation
 
-from app.ai.base import AIServiceBase
+from app.ai.base import AIServiceBase, AIServiceError
 from app.ai.prompts import QWEN_PROMPTS
 from app.models.article import Article, AIAnalysisResult
 from app.config import settings
@@ -24,7 +25,7 @@ class QwenAIService(AIServiceBase):
         dashscope.api_key = settings.DASHSCOPE_API_KEY
         self.model = settings.DASHSCOPE_MODEL
 
-    async def _call_api(
+    async def _complete(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
@@ -32,14 +33,20 @@ class QwenAIService(AIServiceBase):
     ) -> str:
         """调用通义千问API"""
         try:
-            response = Generation.call(
+            response = await self._run_blocking(
+                Generation.call,
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 result_format='message'
             )
+            if response.status_code != HTTPStatus.OK:
+                logger.error(f"Qwen API error: {response.status_code} - {response.code}: {response.message}")
+                raise AIServiceError(f"API error: {response.status_code}", status=response.status_code)
             return response.output.choices[0].message.content
+        except AIServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error calling Qwen API: {e}")
             raise
@@ -0,0 +1,160 @@
+"""
+分层摘要
+文章按token预算分块并发摘要（map），再逐层合并各块摘要（reduce）
+"""
+import asyncio
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.ai.base import AIServiceBase, estimate_tokens, get_provider_concurrency
+from app.ai.prompts import COMMON_PROMPTS
+from app.config import settings
+from app.models.article import Article
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 各服务商 summarize_articles 单次最多处理的文章数
+MAX_ARTICLES_PER_CALL = 20
+
+
+class MapReduceSummarizer:
+    """map-reduce 摘要：单次请求装不下时分块并发摘要后合并"""
+
+    def __init__(self, ai_service: AIServiceBase, token_budget: Optional[int] = None):
+        self.ai_service = ai_service
+        self.token_budget = token_budget or settings.AI_SUMMARY_TOKEN_BUDGET
+        self.chunk_articles = min(settings.AI_SUMMARY_CHUNK_ARTICLES, MAX_ARTICLES_PER_CALL)
+        self.semaphore = asyncio.Semaphore(get_provider_concurrency(ai_service.name))
+
+    async def summarize(self, articles: List[Article], max_summary_length: int = 500) -> Dict[str, Any]:
+        """
+        生成全部文章的总体摘要
+        :return: 包含summary, trending_topics, category的字典
+        """
+        chunks = self.ai_service.pack_articles(
+            articles,
+            token_budget=self.token_budget,
+            max_articles=self.chunk_articles
+        )
+        if len(chunks) <= 1:
+            return await self.ai_service.summarize_articles(articles, max_summary_length)
+
+        logger.info(f"Summarizing {len(articles)} articles in {len(chunks)} chunks")
+        partials = await asyncio.gather(*[self._map(chunk) for chunk in chunks])
+        partials = [p for p in partials if p]
+        if not partials:
+            return {"summary": "无法生成摘要", "trending_topics": [], "category": "科技"}
+
+        return await self._reduce(partials, len(articles), max_summary_length)
+
+    async def merge(
+        self,
+        partials: List[Dict[str, Any]],
+        total_count: int,
+        max_summary_length: int = 500
+    ) -> Dict[str, Any]:
+        """
+        合并多份已有摘要，如滚动摘要与新增文章的摘要
+        :param total_count: 所有摘要覆盖的文章总数
+        """
+        partials = [p for p in partials if p and p.get("summary")]
+        if not partials:
+            return {"summary": "无法生成摘要", "trending_topics": [], "category": "科技"}
+        return await self._reduce(partials, total_count, max_summary_length)
+
+    async def _map(self, chunk: List[Article]) -> Optional[Dict[str, Any]]:
+        """摘要一个分块，失败返回None"""
+        async with self.semaphore:
+            result = await self.ai_service.summarize_articles(chunk)
+        if not result.get("summary") or result["summary"] == "无法生成摘要":
+            return None
+        return result
+
+    async def _reduce(
+        self,
+        partials: List[Dict[str, Any]],
+        total_count: int,
+        max_summary_length: int
+    ) -> Dict[str, Any]:
+        """逐层合并，直到剩余的分块摘要能放进一次请求"""
+        while len(partials) > 1:
+            groups = self._group_partials(partials)
+            if len(groups) == 1:
+                break
+            logger.info(f"Reducing {len(partials)} partial summaries in {len(groups)} groups")
+            partials = await asyncio.gather(*[
+                self._reduce_group(group, total_count, max_summary_length)
+                for group in groups
+            ])
+        if len(partials) == 1:
+            return partials[0]
+        return await self._reduce_group(partials, total_count, max_summary_length)
+
+    def _group_partials(self, partials: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """按token预算把分块摘要分组，每组至少两项以保证逐层收敛"""
+        groups: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        used = 0
+        for partial in partials:
+            cost = estimate_tokens(self._format_partial(partial))
+            if len(current) >= 2 and used + cost > self.token_budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(partial)
+            used += cost
+        if current:
+            groups.append(current)
+        return groups
+
+    def _format_partial(self, partial: Dict[str, Any]) -> str:
+        topics = "、".join(str(t) for t in partial.get("trending_topics", []))
+        return f"摘要：{partial.get('summary', '')}\n热点：{topics}"
+
+    async def _reduce_group(
+        self,
+        group: List[Dict[str, Any]],
+        total_count: int,
+        max_summary_length: int
+    ) -> Dict[str, Any]:
+        """把一组分块摘要合并成一份"""
+        partials_context = "\n\n".join(
+            f"[第{i + 1}组]\n{self._format_partial(partial)}"
+            for i, partial in enumerate(group)
+        )
+        prompt = COMMON_PROMPTS["reduce_summaries"].format(
+            count=total_count,
+            parts=len(group),
+            partials=partials_context,
+            max_length=max_summary_length
+        )
+        messages = [
+            {"role": "system", "content": "你是一个专业的科技资讯分析师。"},
+            {"role": "user", "content": prompt}
+        ]
+
+        try:
+            async with self.semaphore:
+                response = await self.ai_service._call_api(messages, temperature=0.5)
+            result = self.ai_service._extract_json(response)
+            if isinstance(result, dict) and result.get("summary"):
+                return {
+                    "summary": result["summary"],
+                    "trending_topics": result.get("trending_topics", []),
+                    "category": result.get("category", "科技"),
+                }
+        except Exception as e:
+            logger.error(f"Error reducing {len(group)} partial summaries: {e}")
+
+        return self._merge_locally(group, max_summary_length)
+
+    def _merge_locally(self, group: List[Dict[str, Any]], max_summary_length: int) -> Dict[str, Any]:
+        """合并请求失败时，本地拼接摘要并按出现次数挑选热点话题"""
+        summary = " ".join(p.get("summary", "") for p in group)[:max_summary_length]
+        topics = Counter(t for p in group for t in p.get("trending_topics", []))
+        categories = Counter(p.get("category") for p in group if p.get("category"))
+        return {
+            "summary": summary,
+            "trending_topics": [t for t, _ in topics.most_common(5)],
+            "category": categories.most_common(1)[0][0] if categories else "科技",
+        }
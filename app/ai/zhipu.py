@@ -3,13 +3,14 @@
 """
 import json
 from typing import List, Dict, Any
-from zhipuai import ZhipuAI
+from zhipuai import ZhipuAI, APIConnectionError, APIStatusError
 
-from app.ai.base import AIServiceBase
+from app.ai.base import AIServiceBase, AIServiceError
 from app.ai.prompts import ZHIPU_PROMPTS
 from app.models.article import Article, AIAnalysisResult
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.rate_limiter import parse_retry_after
 
 logger = get_logger(__name__)
 
@@ -20,10 +21,11 @@ class ZhipuAIService(AIServiceBase):
     def __init__(self):
         super().__init__()
         self.name = "zhipu"
-        self.client = ZhipuAI(api_key=settings.ZHIPUAI_API_KEY)
+        # 重试由基类统一处理（计入重试预算并反馈给并发限制器），关闭SDK自带重试
+        self.client = ZhipuAI(api_key=settings.ZHIPUAI_API_KEY, max_retries=0)
         self.model = settings.ZHIPUAI_MODEL
 
-    async def _call_api(
+    async def _complete(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
@@ -31,13 +33,25 @@ class ZhipuAIService(AIServiceBase):
     ) -> str:
         """调用智谱AI API"""
         try:
-            response = self.client.chat.completions.create(
+            response = await self._run_blocking(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
             return response.choices[0].message.content
+        except APIStatusError as e:
+            logger.error(f"ZhipuAI API error: {e.status_code} - {e}")
+            raise AIServiceError(
+                f"API error: {e.status_code}",
+                status=e.status_code,
+                retry_after=parse_retry_after(e.response.headers.get("Retry-After"))
+            ) from e
+        except APIConnectionError as e:
+            # 包含 APITimeoutError
+            logger.error(f"Error connecting to ZhipuAI API: {e}")
+            raise AIServiceError(str(e)) from e
         except Exception as e:
             logger.error(f"Error calling ZhipuAI API: {e}")
             raise
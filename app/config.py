@@ -2,7 +2,7 @@
 配置管理模块
 使用 Pydantic Settings 进行配置验证
 """
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -45,6 +45,21 @@ class Settings(BaseSettings):
         description="Celery结果存储URL"
     )
 
+    WORKER_WARMUP: bool = Field(
+        default=False,
+        description="worker进程启动时是否预先导入AI SDK、建立数据库连接和HTTP会话、编译模板"
+    )
+    WORKER_WARMUP_STAGE_TIMEOUT: float = Field(
+        default=5.0,
+        gt=0,
+        description="预热中数据库、HTTP会话等阶段的超时时间（秒），超时后跳过该阶段"
+    )
+    WORKER_PROC_ALIVE_TIMEOUT: float = Field(
+        default=30.0,
+        gt=0,
+        description="worker子进程完成初始化（含预热）的最长时间（秒），超时会被杀掉重启"
+    )
+
     # 定时任务配置
     BRIEFING_HOUR: int = Field(
         default=9,
@@ -102,6 +117,29 @@ class Settings(BaseSettings):
             raise ValueError("AI_PROVIDER must be 'zhipu', 'qwen' or 'openrouter'")
         return v
 
+    AI_FALLBACK_PROVIDER: Optional[str] = Field(
+        default=None,
+        description="备用AI服务提供商，配置后主服务变慢或故障时向其发出对冲请求"
+    )
+    AI_HEDGE_PERCENTILE: int = Field(
+        default=95,
+        ge=50,
+        le=99,
+        description="主服务耗时超过其近期延迟的该分位数时发出对冲请求"
+    )
+    AI_HEDGE_DELAY: float = Field(
+        default=10.0,
+        gt=0,
+        description="主服务延迟样本不足时的对冲等待时间（秒）"
+    )
+
+    @field_validator("AI_FALLBACK_PROVIDER")
+    @classmethod
+    def validate_ai_fallback_provider(cls, v: Optional[str]) -> Optional[str]:
+        if v and v not in ["zhipu", "qwen", "openrouter"]:
+            raise ValueError("AI_FALLBACK_PROVIDER must be 'zhipu', 'qwen' or 'openrouter'")
+        return v or None
+
     # Telegram配置
     TELEGRAM_BOT_TOKEN: Optional[str] = Field(
         default=None,
@@ -164,6 +202,306 @@ class Settings(BaseSettings):
         ],
         description="User-Agent列表"
     )
+    SCRAPER_RATE_LIMIT: float = Field(
+        default=2.0,
+        gt=0,
+        description="每个主机默认每秒请求数"
+    )
+    SCRAPER_RATE_BURST: int = Field(
+        default=5,
+        ge=1,
+        description="每个主机默认突发请求数"
+    )
+    SCRAPER_HOST_RATE_LIMITS: Dict[str, List[float]] = Field(
+        default_factory=lambda: {
+            "hacker-news.firebaseio.com": [10.0, 20],
+        },
+        description="按主机覆盖限速，格式为 {主机: [每秒请求数, 突发数]}"
+    )
+    SCRAPER_BACKOFF_MAX: float = Field(
+        default=60.0,
+        gt=0,
+        description="重试退避和Retry-After的最长等待时间（秒）"
+    )
+
+    # HTML解析配置
+    HTML_PARSER: str = Field(
+        default="lxml",
+        description="BeautifulSoup解析后端: lxml 或 html.parser"
+    )
+    SCRAPER_PARSE_EXECUTOR: str = Field(
+        default="inline",
+        description="HTML解析执行方式: inline, thread 或 process"
+    )
+    SCRAPER_PARSE_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        description="解析线程池/进程池大小"
+    )
+
+    @field_validator("SCRAPER_PARSE_EXECUTOR")
+    @classmethod
+    def validate_parse_executor(cls, v: str) -> str:
+        if v not in ["inline", "thread", "process"]:
+            raise ValueError("SCRAPER_PARSE_EXECUTOR must be 'inline', 'thread' or 'process'")
+        return v
+
+    # Hacker News配置
+    HN_MAX_CONCURRENCY: int = Field(
+        default=10,
+        ge=1,
+        description="同时获取HN条目详情的最大请求数"
+    )
+    HN_ITEM_CACHE_TTL: int = Field(
+        default=6 * 3600,
+        ge=0,
+        description="HN条目缓存有效期（秒），过期后刷新分数等可变字段"
+    )
+    HN_ITEM_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        ge=1,
+        description="HN条目缓存最大条目数"
+    )
+
+    # HTTP连接池配置
+    HTTP_POOL_LIMIT: int = Field(
+        default=100,
+        ge=1,
+        description="共享连接池最大连接数"
+    )
+    HTTP_POOL_LIMIT_PER_HOST: int = Field(
+        default=10,
+        ge=1,
+        description="单个主机最大连接数"
+    )
+    HTTP_DNS_CACHE_TTL: int = Field(
+        default=300,
+        ge=0,
+        description="DNS缓存时间（秒）"
+    )
+    HTTP_KEEPALIVE_TIMEOUT: float = Field(
+        default=30.0,
+        ge=0,
+        description="空闲连接保持时间（秒）"
+    )
+
+    # HTTP条件请求缓存配置
+    HTTP_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="是否启用ETag/Last-Modified条件请求缓存"
+    )
+    HTTP_CACHE_MAX_ENTRIES: int = Field(
+        default=1000,
+        ge=1,
+        description="HTTP缓存最大条目数"
+    )
+
+    # 采集流水线配置
+    PIPELINE_STREAMING: bool = Field(
+        default=False,
+        description="是否启用流式采集：数据源边抓取边入库和分析"
+    )
+    PIPELINE_BATCH_SIZE: int = Field(
+        default=20,
+        ge=1,
+        description="流式采集每批入库的文章数"
+    )
+    PIPELINE_FLUSH_INTERVAL: float = Field(
+        default=2.0,
+        gt=0,
+        description="流式采集中文章最长等待入库时间（秒）"
+    )
+
+    # 本地预排序配置
+    RANKING_SOURCE_WEIGHTS: Dict[str, float] = Field(
+        default={},
+        description="各数据源的排序权重，未配置的数据源为1.0，如 {\"hackernews\": 1.2}"
+    )
+    RANKING_HALF_LIFE_HOURS: float = Field(
+        default=12.0,
+        gt=0,
+        description="排序时效分的半衰期（小时）"
+    )
+    RANKING_ENGAGEMENT_WEIGHT: float = Field(
+        default=0.5,
+        ge=0,
+        le=1,
+        description="排序分中互动数据（积分/评论）所占权重，其余为时效分"
+    )
+
+    # 近似重复检测配置
+    DEDUP_ENABLED: bool = Field(
+        default=True,
+        description="是否在入库前过滤跨数据源、跨天的近似重复文章"
+    )
+    DEDUP_MAX_DISTANCE: int = Field(
+        default=3,
+        ge=0,
+        le=3,
+        description="标题SimHash指纹海明距离不超过该值视为重复"
+    )
+    DEDUP_WINDOW_DAYS: int = Field(
+        default=3,
+        ge=1,
+        description="去重索引保留的天数"
+    )
+
+    # 已入库URL布隆过滤器配置
+    SEEN_URL_FILTER_ENABLED: bool = Field(
+        default=True,
+        description="是否用布隆过滤器记录已入库URL，爬虫据此跳过已知条目的详情抓取"
+    )
+    SEEN_URL_FILTER_CAPACITY: int = Field(
+        default=1000000,
+        ge=1000,
+        description="布隆过滤器容量，超过后清空重建"
+    )
+    SEEN_URL_FILTER_ERROR_RATE: float = Field(
+        default=0.01,
+        gt=0,
+        lt=1,
+        description="布隆过滤器期望误判率"
+    )
+
+    # AI分析并发配置
+    AI_MAX_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description="同时进行的文章分析请求数"
+    )
+    AI_PROVIDER_CONCURRENCY: Dict[str, int] = Field(
+        default_factory=dict,
+        description="按服务商覆盖并发数，如 {\"zhipu\": 8}"
+    )
+    AI_ANALYSIS_TIMEOUT: float = Field(
+        default=60.0,
+        gt=0,
+        description="单篇文章分析请求的超时时间（秒），不含等待并发名额的时间"
+    )
+    AI_ANALYSIS_TOP_K: int = Field(
+        default=60,
+        ge=0,
+        description="每次简报只把本地排序前K篇文章交给大模型分析，0表示全部分析"
+    )
+    BRIEFING_ANALYSIS_DEADLINE: float = Field(
+        default=900.0,
+        ge=0,
+        description="从简报任务开始计时的AI分析截止时间（秒），到期后先生成简报，其余文章转后台分析；0表示不限时"
+    )
+
+    @field_validator("BRIEFING_ANALYSIS_DEADLINE", mode="before")
+    @classmethod
+    def validate_analysis_deadline(cls, v: Any) -> Any:
+        # 留空等同于0，不限时
+        return 0 if v == "" else v
+
+    # AI批量分析配置
+    AI_BATCH_ANALYSIS: bool = Field(
+        default=False,
+        description="是否将多篇文章合并到一次请求中分析"
+    )
+    AI_BATCH_TOKEN_BUDGET: int = Field(
+        default=3000,
+        ge=500,
+        description="批量分析每次请求的输入token预算"
+    )
+    AI_BATCH_MAX_ARTICLES: int = Field(
+        default=10,
+        ge=1,
+        description="批量分析每次请求最多包含的文章数"
+    )
+    AI_BATCH_TIMEOUT: float = Field(
+        default=180.0,
+        gt=0,
+        description="批量分析单次请求超时时间（秒）"
+    )
+
+    # 总体摘要配置
+    AI_SUMMARY_TOKEN_BUDGET: int = Field(
+        default=6000,
+        ge=1000,
+        description="总体摘要每次请求的输入token预算，超出时分块摘要后合并"
+    )
+    AI_SUMMARY_CHUNK_ARTICLES: int = Field(
+        default=20,
+        ge=2,
+        le=20,
+        description="分块摘要时每块最多文章数"
+    )
+
+    # 大模型自适应并发与重试配置
+    AI_ADAPTIVE_CONCURRENCY: bool = Field(
+        default=True,
+        description="是否按延迟和错误率自适应调整大模型并发数（AIMD）"
+    )
+    AI_AIMD_MIN_CONCURRENCY: int = Field(
+        default=1,
+        ge=1,
+        description="自适应并发的下限"
+    )
+    AI_AIMD_INITIAL_CONCURRENCY: int = Field(
+        default=2,
+        ge=1,
+        description="自适应并发的初始值"
+    )
+    AI_AIMD_MAX_CONCURRENCY: int = Field(
+        default=16,
+        ge=1,
+        description="自适应并发的上限，低于服务商并发配置时以服务商配置为准"
+    )
+    AI_AIMD_LATENCY_FACTOR: float = Field(
+        default=3.0,
+        gt=1,
+        description="单次延迟超过平均延迟的倍数时视为延迟突增并减半并发"
+    )
+    AI_MAX_RETRIES: int = Field(
+        default=3,
+        ge=0,
+        description="单个大模型请求遇到429/5xx/网络错误时的最大重试次数"
+    )
+    AI_RETRY_BUDGET: int = Field(
+        default=50,
+        ge=0,
+        description="每次简报运行内所有大模型请求共享的重试次数上限"
+    )
+    AI_RETRY_BASE_DELAY: float = Field(
+        default=1.0,
+        gt=0,
+        description="大模型重试的基础退避时间（秒）"
+    )
+    AI_RETRY_MAX_DELAY: float = Field(
+        default=30.0,
+        gt=0,
+        description="大模型重试的最大退避时间（秒）"
+    )
+
+    # 大模型响应缓存配置
+    LLM_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="是否缓存大模型响应"
+    )
+    LLM_CACHE_TTL: int = Field(
+        default=7 * 24 * 3600,
+        ge=60,
+        description="大模型响应缓存有效期（秒）"
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        ge=1,
+        description="大模型响应缓存最大条目数"
+    )
+
+    # AI分析结果写回配置
+    ANALYSIS_WRITE_BATCH_SIZE: int = Field(
+        default=20,
+        ge=1,
+        description="AI分析结果每批写回数据库的条数"
+    )
+    ANALYSIS_WRITE_INTERVAL: float = Field(
+        default=10.0,
+        gt=0,
+        description="AI分析结果最长写回间隔（秒）"
+    )
 
     # 输出配置
     OUTPUT_DIR: str = Field(
@@ -174,8 +512,30 @@ class Settings(BaseSettings):
         default="./logs",
         description="日志目录"
     )
+    CACHE_DIR: str = Field(
+        default="./cache",
+        description="本地缓存目录"
+    )
 
     # 简报配置
+    BRIEFING_INCREMENTAL: bool = Field(
+        default=False,
+        description="是否全天定期增量采集、分析并更新滚动摘要，定时生成简报时只需合并和渲染"
+    )
+    BRIEFING_INCREMENTAL_INTERVAL: int = Field(
+        default=60,
+        ge=5,
+        description="增量更新间隔（分钟）"
+    )
+    BRIEFING_CANVAS: bool = Field(
+        default=False,
+        description="是否把简报生成拆分为采集、分析、汇总等阶段任务，由多个worker并行执行；多台主机运行worker时 CACHE_DIR 需为共享目录，否则去重索引和已入库URL过滤器只在本机生效"
+    )
+    BRIEFING_ANALYSIS_CHUNK_SIZE: int = Field(
+        default=10,
+        ge=1,
+        description="阶段任务模式下每个分析任务处理的文章数"
+    )
     MAX_ARTICLES_PER_SOURCE: int = Field(
         default=10,
         ge=1,
@@ -3,6 +3,7 @@
 """
 from app.models.article import Base
 from app.database.crud import engine, async_session_maker
+from app.database.migrations import run_migrations
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,6 +13,7 @@ async def init_db():
     """初始化数据库"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
     logger.info("Database initialized")
 
 
@@ -1,14 +1,17 @@
 """
 数据库CRUD操作
 """
-from typing import List, Optional, Dict, Any
-from datetime import datetime, date, timedelta
+from typing import List, Optional, Dict, Any, Set
+from datetime import datetime, date, time, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.config import settings
-from app.models.article import ArticleORM, BriefingORM, Article, Briefing, ArticleCreate, BriefingCreate
+from app.models.article import (
+    ArticleORM, BriefingORM, BriefingRunStageORM, Article, Briefing, ArticleCreate, BriefingCreate
+)
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -82,15 +85,60 @@ class ArticleCRUD:
         article_orm = result.scalar_one_or_none()
         return Article.from_orm(article_orm) if article_orm else None
 
+    @staticmethod
+    async def get_articles_by_ids(
+        session: AsyncSession,
+        article_ids: List[int]
+    ) -> List[Article]:
+        """根据ID列表批量获取文章"""
+        if not article_ids:
+            return []
+        result = await session.execute(
+            select(ArticleORM).where(ArticleORM.id.in_(article_ids))
+        )
+        articles = result.scalars().all()
+        return [Article.from_orm(a) for a in articles]
+
+    @staticmethod
+    async def get_articles_by_urls(
+        session: AsyncSession,
+        urls: List[str]
+    ) -> List[Article]:
+        """根据URL列表批量获取文章"""
+        if not urls:
+            return []
+        result = await session.execute(
+            select(ArticleORM).where(ArticleORM.url.in_(urls))
+        )
+        articles = result.scalars().all()
+        return [Article.from_orm(a) for a in articles]
+
+    @staticmethod
+    async def get_existing_urls(
+        session: AsyncSession,
+        urls: List[str]
+    ) -> Set[str]:
+        """返回URL列表中已入库的URL，只查询url列"""
+        if not urls:
+            return set()
+        result = await session.execute(
+            select(ArticleORM.url).where(ArticleORM.url.in_(urls))
+        )
+        return set(result.scalars().all())
+
     @staticmethod
     async def get_articles_by_date(
         session: AsyncSession,
         date: date
     ) -> List[Article]:
         """获取指定日期的文章"""
+        # 使用范围条件而非 func.date()，以便命中 (created_at, score) 索引
+        start = datetime.combine(date, time.min)
+        end = start + timedelta(days=1)
         result = await session.execute(
             select(ArticleORM).where(
-                func.date(ArticleORM.created_at) == date
+                ArticleORM.created_at >= start,
+                ArticleORM.created_at < end
             ).order_by(ArticleORM.score.desc())
         )
         articles = result.scalars().all()
@@ -132,38 +180,55 @@ class ArticleCRUD:
     @staticmethod
     async def batch_create_articles(
         session: AsyncSession,
-        articles: List[ArticleCreate]
+        articles: List[ArticleCreate],
+        chunk_size: int = 500
     ) -> Dict[str, Any]:
-        """批量创建文章"""
-        created_count = 0
+        """
+        批量创建文章，URL已存在的文章跳过
+        每个分块执行一次 INSERT ... ON CONFLICT (url) DO NOTHING RETURNING id
+        返回的 stored_urls 为新建或已存在的文章URL，不含写入失败的分块
+        """
+        created_ids: List[int] = []
+        stored_urls: List[str] = []
         skipped_count = 0
         errors = []
 
+        # 同一批次内的重复URL只保留第一篇
+        unique_articles: Dict[str, ArticleCreate] = {}
         for article_data in articles:
+            unique_articles.setdefault(article_data.url, article_data)
+        skipped_count += len(articles) - len(unique_articles)
+
+        rows = [a.model_dump() for a in unique_articles.values()]
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            stmt = (
+                pg_insert(ArticleORM)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[ArticleORM.url])
+                .returning(ArticleORM.id)
+            )
             try:
-                # 检查是否已存在
-                existing = await ArticleCRUD.get_article_by_url(session, article_data.url)
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                article_orm = ArticleORM(**article_data.model_dump())
-                session.add(article_orm)
-                created_count += 1
+                result = await session.execute(stmt)
+                inserted_ids = list(result.scalars().all())
+                await session.commit()
             except Exception as e:
+                await session.rollback()
                 errors.append(str(e))
-                logger.error(f"Error creating article: {e}")
+                logger.error(f"Error inserting batch of {len(chunk)} articles: {e}")
+                continue
 
-        try:
-            await session.commit()
-            logger.info(f"Batch created {created_count} articles, skipped {skipped_count}")
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Error committing batch: {e}")
+            created_ids.extend(inserted_ids)
+            stored_urls.extend(row["url"] for row in chunk)
+            skipped_count += len(chunk) - len(inserted_ids)
+
+        logger.info(f"Batch created {len(created_ids)} articles, skipped {skipped_count}")
 
         return {
-            "created": created_count,
+            "created": len(created_ids),
             "skipped": skipped_count,
+            "created_ids": created_ids,
+            "stored_urls": stored_urls,
             "errors": errors
         }
 
@@ -195,6 +260,30 @@ class ArticleCRUD:
             logger.error(f"Error updating article: {e}")
             return None
 
+    @staticmethod
+    async def bulk_update_analysis(
+        session: AsyncSession,
+        updates: List[Dict[str, Any]],
+        chunk_size: int = 500
+    ) -> int:
+        """
+        批量写回AI分析结果
+        :param updates: 每项包含 id, summary, keywords, score
+        :return: 写入的条数
+        """
+        updated_count = 0
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start:start + chunk_size]
+            try:
+                # 按主键批量UPDATE，驱动层以 executemany 执行
+                await session.execute(update(ArticleORM), chunk)
+                await session.commit()
+                updated_count += len(chunk)
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Error updating batch of {len(chunk)} articles: {e}")
+        return updated_count
+
 
 # 简报CRUD操作
 class BriefingCRUD:
@@ -207,7 +296,7 @@ class BriefingCRUD:
     ) -> Optional[Briefing]:
         """创建简报"""
         try:
-            briefing_orm = BriefingORM(**briefing_data.model_dump())
+            briefing_orm = BriefingORM(**briefing_data.model_dump(by_alias=True))
             session.add(briefing_orm)
             await session.commit()
             await session.refresh(briefing_orm)
@@ -222,6 +311,25 @@ class BriefingCRUD:
             logger.error(f"Error creating briefing: {e}")
             return None
 
+    @staticmethod
+    async def upsert_briefing(
+        session: AsyncSession,
+        briefing_data: BriefingCreate
+    ) -> Briefing:
+        """创建当天的简报记录，已存在时更新文章数和页面路径，保留已发送通知的状态"""
+        stmt = pg_insert(BriefingORM).values(**briefing_data.model_dump(by_alias=True))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BriefingORM.date],
+            set_={
+                "total_articles": stmt.excluded.total_articles,
+                "html_path": stmt.excluded.html_path
+            }
+        ).returning(BriefingORM)
+        result = await session.execute(stmt)
+        briefing_orm = result.scalar_one()
+        await session.commit()
+        return Briefing.from_orm(briefing_orm)
+
     @staticmethod
     async def get_briefing_by_date(
         session: AsyncSession,
@@ -279,3 +387,48 @@ class BriefingCRUD:
         )
         briefings = result.scalars().all()
         return [Briefing.from_orm(b) for b in briefings]
+
+
+# 简报阶段检查点操作
+class BriefingRunCRUD:
+    """简报生成阶段检查点操作类"""
+
+    @staticmethod
+    async def get_completed_stages(
+        session: AsyncSession,
+        run_date: date
+    ) -> Dict[str, Any]:
+        """获取指定日期已完成的阶段，返回 阶段 -> 输出"""
+        result = await session.execute(
+            select(BriefingRunStageORM).where(BriefingRunStageORM.run_date == run_date)
+        )
+        return {row.stage: row.output for row in result.scalars().all()}
+
+    @staticmethod
+    async def complete_stage(
+        session: AsyncSession,
+        run_date: date,
+        stage: str,
+        output: Optional[Dict[str, Any]] = None
+    ):
+        """记录阶段完成，已存在时覆盖输出"""
+        stmt = pg_insert(BriefingRunStageORM).values(
+            run_date=run_date,
+            stage=stage,
+            output=output,
+            completed_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BriefingRunStageORM.run_date, BriefingRunStageORM.stage],
+            set_={"output": stmt.excluded.output, "completed_at": stmt.excluded.completed_at}
+        )
+        await session.execute(stmt)
+        await session.commit()
+
+    @staticmethod
+    async def clear_stages(session: AsyncSession, run_date: date):
+        """清除指定日期的检查点，下次运行从头开始"""
+        await session.execute(
+            delete(BriefingRunStageORM).where(BriefingRunStageORM.run_date == run_date)
+        )
+        await session.commit()
@@ -0,0 +1,25 @@
+"""
+数据库结构迁移
+create_all 只会创建缺失的表，已有表上新增的索引和字段在这里以幂等语句补齐
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 按顺序执行，每条语句都必须可重复执行
+# 数据量很大时，可先手动执行 CREATE INDEX CONCURRENTLY 避免锁表
+MIGRATIONS = [
+    "CREATE INDEX IF NOT EXISTS ix_articles_created_at_score ON articles (created_at, score DESC)",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS points INTEGER",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS comments INTEGER",
+]
+
+
+async def run_migrations(conn: AsyncConnection):
+    """执行所有迁移语句"""
+    for statement in MIGRATIONS:
+        await conn.execute(text(statement))
+    logger.info(f"Applied {len(MIGRATIONS)} schema migrations")
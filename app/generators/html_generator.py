@@ -4,8 +4,8 @@ HTML页面生成器
 """
 from datetime import datetime, date
 from pathlib import Path
-from typing import List, Dict
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from typing import List, Dict, Optional
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
 
 from app.models.article import Article, BriefingData
 from app.config import settings
@@ -14,6 +14,9 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+TEMPLATES = ("briefing.html", "index.html")
+
+
 class HTMLGenerator:
     """HTML页面生成器"""
 
@@ -28,6 +31,17 @@ class HTMLGenerator:
             autoescape=select_autoescape(['html', 'xml'])
         )
 
+    def precompile(self) -> int:
+        """预编译简报模板，编译结果缓存在Jinja2环境中；返回编译成功的模板数"""
+        compiled = 0
+        for name in TEMPLATES:
+            try:
+                self.env.get_template(name)
+                compiled += 1
+            except TemplateNotFound:
+                logger.warning(f"Template not found: {name}")
+        return compiled
+
     def generate_briefing(
         self,
         briefing_data: BriefingData,
@@ -123,3 +137,14 @@ class HTMLGenerator:
         except Exception as e:
             logger.error(f"Error generating index: {e}")
             raise
+
+
+_generator: Optional[HTMLGenerator] = None
+
+
+def get_html_generator() -> HTMLGenerator:
+    """获取进程内共享的HTML生成器，复用已编译的模板"""
+    global _generator
+    if _generator is None:
+        _generator = HTMLGenerator()
+    return _generator
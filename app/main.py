@@ -12,6 +12,7 @@ from app.database import init_db
 from app.database.crud import BriefingCRUD, ArticleCRUD
 from app.database import async_session_maker
 from app.models.article import Briefing, Article
+from app.utils.http_client import close_http_session
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -32,6 +33,12 @@ async def startup_event():
     logger.info("Application started successfully")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """应用关闭时执行"""
+    await close_http_session()
+
+
 @app.get("/")
 async def root():
     """根路径"""
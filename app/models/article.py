@@ -4,7 +4,7 @@
 from datetime import datetime, date
 from typing import Optional, List
 from pydantic import BaseModel, Field, HttpUrl, field_validator
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Date, Boolean, ARRAY
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Date, Boolean, ARRAY, Index, JSON, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import ARRAY as PG_ARRAY
 
@@ -25,8 +25,15 @@ class ArticleORM(Base):
     keywords = Column(PG_ARRAY(String), nullable=True)
     published_at = Column(DateTime, nullable=True)
     score = Column(Float, default=0.0)
+    points = Column(Integer, nullable=True)
+    comments = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 按日期范围查询并按评分排序（今日文章接口）
+        Index("ix_articles_created_at_score", created_at, score.desc()),
+    )
+
 
 class BriefingORM(Base):
     """简报表ORM模型"""
@@ -41,6 +48,21 @@ class BriefingORM(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class BriefingRunStageORM(Base):
+    """简报生成阶段检查点表：记录每天每个阶段的完成情况和输出，重跑时从未完成的阶段继续"""
+    __tablename__ = "briefing_run_stages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_date = Column(Date, nullable=False, index=True)
+    stage = Column(String(50), nullable=False)
+    output = Column(JSON, nullable=True)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("run_date", "stage", name="uq_briefing_run_stages_date_stage"),
+    )
+
+
 # Pydantic模型用于API
 class ArticleBase(BaseModel):
     """文章基础模型"""
@@ -49,6 +71,8 @@ class ArticleBase(BaseModel):
     source: str = Field(..., max_length=50, description="数据源")
     content: Optional[str] = Field(None, description="文章内容")
     published_at: Optional[datetime] = Field(None, description="发布时间")
+    points: Optional[int] = Field(None, description="来源站点的点赞/积分数")
+    comments: Optional[int] = Field(None, description="来源站点的评论/回复数")
 
 
 class ArticleCreate(ArticleBase):
@@ -111,6 +135,8 @@ class ScrapedArticle(BaseModel):
     published_at: Optional[datetime] = None
     author: Optional[str] = None
     tags: Optional[List[str]] = None
+    points: Optional[int] = None
+    comments: Optional[int] = None
 
 
 # AI分析结果模型
@@ -0,0 +1,153 @@
+"""
+AI分析执行与结果处理
+并发分析文章，分析结果先进入缓冲区，攒批后一次写回数据库
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.ai.base import AIServiceBase, get_provider_concurrency, request_timeout
+from app.config import settings
+from app.database import async_session_maker
+from app.database.crud import ArticleCRUD
+from app.models.article import AIAnalysisResult, Article
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AnalysisWriter:
+    """分析结果写回缓冲：攒够一批或距上次写入超过刷新间隔时批量写库"""
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None):
+        self.batch_size = batch_size or settings.ANALYSIS_WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.ANALYSIS_WRITE_INTERVAL
+        self.buffer: List[Dict[str, Any]] = []
+        self.written = 0
+        self._last_flush = time.monotonic()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.flush()
+
+    async def add_result(self, article: Article, analysis: AIAnalysisResult):
+        """ConcurrentAnalyzer 回调形式的 add"""
+        await self.add(article.id, analysis)
+
+    async def add(self, article_id: int, analysis: AIAnalysisResult):
+        """加入一条分析结果，必要时触发写库"""
+        self.buffer.append({
+            "id": article_id,
+            "summary": analysis.summary,
+            "keywords": analysis.keywords,
+            "score": analysis.score,
+        })
+        now = time.monotonic()
+        if len(self.buffer) >= self.batch_size or now - self._last_flush >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self):
+        """把缓冲区写回数据库"""
+        self._last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        # 先交换缓冲区，写库期间其他协程可以继续追加
+        updates, self.buffer = self.buffer, []
+        async with async_session_maker() as session:
+            self.written += await ArticleCRUD.bulk_update_analysis(session, updates)
+        logger.debug(f"Flushed {len(updates)} analysis results")
+
+
+def _successful(result: Optional[AIAnalysisResult]) -> Optional[AIAnalysisResult]:
+    """服务商出错时返回空摘要的结果，视为失败，不写回，留给后续分析重试"""
+    if result is None or not result.summary:
+        return None
+    return result
+
+
+class ConcurrentAnalyzer:
+    """并发分析文章：按服务商限制并发数，单篇超时，结果按输入顺序返回"""
+
+    def __init__(
+        self,
+        ai_service: AIServiceBase,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.ai_service = ai_service
+        self.concurrency = concurrency or get_provider_concurrency(ai_service.name)
+        self.timeout = timeout or settings.AI_ANALYSIS_TIMEOUT
+        self.batch_mode = settings.AI_BATCH_ANALYSIS
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def analyze_one(self, article: Article) -> Optional[AIAnalysisResult]:
+        """
+        在并发上限内分析单篇文章，超时、出错或返回空摘要时返回None
+        超时只限制单次接口请求，不包括在自适应并发限制器中排队的时间
+        """
+        async with self.semaphore:
+            token = request_timeout.set(self.timeout)
+            try:
+                return _successful(await self.ai_service.analyze_article(article))
+            except Exception as e:
+                logger.error(f"Error analyzing article {article.id}: {e}")
+            finally:
+                request_timeout.reset(token)
+        return None
+
+    async def analyze_batch(self, articles: List[Article]) -> List[Optional[AIAnalysisResult]]:
+        """在并发上限内用一次请求分析一批文章，出错时整批返回None，超时或空摘要的条目为None"""
+        async with self.semaphore:
+            token = request_timeout.set(settings.AI_BATCH_TIMEOUT)
+            try:
+                results = await self.ai_service.analyze_batch(articles)
+                return [_successful(result) for result in results]
+            except Exception as e:
+                logger.error(f"Error analyzing batch of {len(articles)} articles: {e}")
+            finally:
+                request_timeout.reset(token)
+        return [None] * len(articles)
+
+    async def analyze(
+        self,
+        articles: List[Article],
+        on_result: Optional[Callable[[Article, AIAnalysisResult], Awaitable[None]]] = None
+    ) -> List[Optional[AIAnalysisResult]]:
+        """
+        并发分析一组文章，启用 AI_BATCH_ANALYSIS 时按token预算合并请求
+        :param articles: 文章列表
+        :param on_result: 每篇分析成功后立即调用的回调，如写回缓冲
+        :return: 与输入顺序一致的分析结果，失败项为None
+        """
+        if self.batch_mode and len(articles) > 1:
+            batches = self.ai_service.pack_articles(articles)
+        else:
+            batches = [[article] for article in articles]
+
+        async def run(batch: List[Article]) -> List[Optional[AIAnalysisResult]]:
+            if len(batch) == 1:
+                batch_results = [await self.analyze_one(batch[0])]
+            else:
+                batch_results = await self.analyze_batch(batch)
+            if on_result is not None:
+                for article, result in zip(batch, batch_results):
+                    if result is not None:
+                        await on_result(article, result)
+            return batch_results
+
+        nested = await asyncio.gather(*[run(batch) for batch in batches])
+        results = [result for batch_results in nested for result in batch_results]
+        succeeded = sum(1 for r in results if r is not None)
+        logger.info(
+            f"Analyzed {succeeded}/{len(articles)} articles in {len(batches)} requests "
+            f"with concurrency {self.concurrency}"
+        )
+        return results
@@ -0,0 +1,172 @@
+"""
+近似重复检测
+规范化URL后精确去重，标题按字符n-gram计算SimHash指纹，通过分段LSH索引查找海明距离相近的文章；
+索引持久化到缓存目录，跨数据源、跨天识别同一条新闻
+"""
+import hashlib
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+import numpy as np
+
+from app.config import settings
+from app.models.article import ScrapedArticle
+from app.utils.disk_cache import DiskCache
+from app.utils.helpers import canonicalize_url
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FINGERPRINT_BITS = 64
+# 64位指纹分为4段，海明距离不超过3时至少有一段完全相同
+LSH_BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // LSH_BANDS
+SHINGLE_SIZE = 3
+# 规范化后短于该长度的标题不做近似匹配，避免误判
+MIN_TITLE_LENGTH = 8
+
+INDEX_KEY = "simhash_index"
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+_BIT_SHIFTS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def normalize_title(title: str) -> str:
+    """小写并去掉空白和标点"""
+    return _NON_WORD_RE.sub("", (title or "").lower())
+
+
+def simhash(text: str) -> Optional[int]:
+    """计算字符n-gram的64位SimHash，文本过短时返回None"""
+    if len(text) < MIN_TITLE_LENGTH:
+        return None
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles],
+        dtype=np.uint64
+    )
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    # 每一位上1多于0则指纹该位为1
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return sum(1 << int(i) for i in np.flatnonzero(votes))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@contextmanager
+def _index_lock() -> Iterator[None]:
+    """跨进程的索引文件锁"""
+    lock_path = Path(settings.CACHE_DIR) / "dedup" / ".lock"
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _band_keys(fingerprint: int) -> List[str]:
+    mask = (1 << BAND_BITS) - 1
+    return [f"{band}:{(fingerprint >> (band * BAND_BITS)) & mask:x}" for band in range(LSH_BANDS)]
+
+
+class NearDuplicateDetector:
+    """跨天持久化的近似重复检测器"""
+
+    def __init__(self, max_distance: Optional[int] = None, window_days: Optional[int] = None):
+        """
+        :param max_distance: 视为重复的最大海明距离，默认 DEDUP_MAX_DISTANCE
+        :param window_days: 索引保留天数，默认 DEDUP_WINDOW_DAYS
+        """
+        self.max_distance = settings.DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.window_days = window_days or settings.DEDUP_WINDOW_DAYS
+        self.store = DiskCache("dedup", max_entries=10)
+        # 条目：[规范化URL, 指纹或None, 日期]
+        self.entries: List[list] = []
+        self.urls: Set[str] = set()
+        # 已通过检查但尚未确认入库的URL，不会被持久化
+        self.pending: Set[str] = set()
+        self.bands: Dict[str, List[int]] = {}
+        self._load()
+
+    def _load(self):
+        """载入窗口期内的索引"""
+        cutoff = (date.today() - timedelta(days=self.window_days)).isoformat()
+        for entry in self.store.get(INDEX_KEY) or []:
+            if len(entry) == 3 and entry[2] >= cutoff:
+                self._index(*entry)
+        logger.debug(f"Loaded {len(self.entries)} dedup index entries")
+
+    def _index(self, url: str, fingerprint: Optional[int], day: str):
+        position = len(self.entries)
+        self.entries.append([url, fingerprint, day])
+        self.urls.add(url)
+        if fingerprint is not None:
+            for key in _band_keys(fingerprint):
+                self.bands.setdefault(key, []).append(position)
+
+    def find_duplicate(self, url: str, fingerprint: Optional[int]) -> Optional[str]:
+        """查找已收录的重复文章，返回其规范化URL"""
+        if url in self.urls:
+            return url
+        if fingerprint is None:
+            return None
+        candidates = {p for key in _band_keys(fingerprint) for p in self.bands.get(key, [])}
+        for position in candidates:
+            other_url, other_fingerprint, _ = self.entries[position]
+            if hamming_distance(fingerprint, other_fingerprint) <= self.max_distance:
+                return other_url
+        return None
+
+    def check(self, article: ScrapedArticle) -> Optional[str]:
+        """
+        检查文章是否与已收录文章重复，不重复时暂时收录，入库成功后需调用 commit() 确认
+        :return: 重复时返回已收录文章的规范化URL，否则返回None
+        """
+        url = canonicalize_url(article.url)
+        fingerprint = simhash(normalize_title(article.title))
+        duplicate = self.find_duplicate(url, fingerprint)
+        if duplicate is None:
+            self._index(url, fingerprint, date.today().isoformat())
+            self.pending.add(url)
+        return duplicate
+
+    def commit(self, urls: Iterable[str]):
+        """确认文章已入库，之后 save() 才会持久化这些条目；入库失败的文章不确认，下次运行可重新采集"""
+        self.pending.difference_update(canonicalize_url(url) for url in urls)
+
+    def filter(self, articles: List[ScrapedArticle]) -> Tuple[List[ScrapedArticle], int]:
+        """过滤重复文章，返回 (保留的文章, 重复数)"""
+        unique = [article for article in articles if self.check(article) is None]
+        return unique, len(articles) - len(unique)
+
+    def save(self):
+        """
+        持久化已确认入库的条目
+        加文件锁后与磁盘上的最新索引合并再写回，多个进程并发去重时不会互相覆盖；
+        锁只在这段同步读写期间持有，异步代码中应通过 asyncio.to_thread 调用
+        """
+        committed = [entry for entry in self.entries if entry[0] not in self.pending]
+        cutoff = (date.today() - timedelta(days=self.window_days)).isoformat()
+        with _index_lock():
+            merged = {
+                entry[0]: entry
+                for entry in self.store.get(INDEX_KEY) or []
+                if len(entry) == 3 and entry[2] >= cutoff
+            }
+            for entry in committed:
+                merged.setdefault(entry[0], entry)
+            self.store.set(INDEX_KEY, list(merged.values()))
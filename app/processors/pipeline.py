@@ -0,0 +1,190 @@
+"""
+流式采集流水线
+数据源边抓取边入库，新文章入库后立即进入AI分析，最慢的数据源不再阻塞整个流程
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.ai.base import AIServiceBase
+from app.config import settings
+from app.database import async_session_maker
+from app.database.crud import ArticleCRUD
+from app.models.article import ArticleCreate, ScrapedArticle
+from app.processors.analysis import AnalysisWriter, ConcurrentAnalyzer
+from app.processors.dedup import NearDuplicateDetector
+from app.scrapers import feed_all_sources
+from app.utils.bloom import mark_seen
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IngestionPipeline:
+    """流式采集流水线：抓取 -> 去重（含近似重复） -> 入库 -> AI分析"""
+
+    def __init__(self, ai_service: AIServiceBase, deadline: Optional[float] = None):
+        """
+        :param ai_service: AI服务
+        :param deadline: 分析截止时间（time.monotonic() 时刻），到期后停止分析，为None时不限时
+        """
+        self.ai_service = ai_service
+        self.deadline = deadline
+        self.batch_size = settings.PIPELINE_BATCH_SIZE
+        self.flush_interval = settings.PIPELINE_FLUSH_INTERVAL
+        self.analyzer = ConcurrentAnalyzer(ai_service)
+        self.seen_urls: Set[str] = set()
+        self.queued_ids: Set[int] = set()
+        # 分析成功的文章ID，失败或超时的文章留给后续分析步骤
+        self.analyzed_ids: Set[int] = set()
+        self.writer = AnalysisWriter()
+        self.dedup = NearDuplicateDetector() if settings.DEDUP_ENABLED else None
+        self.stats: Dict[str, int] = {
+            "fetched": 0,
+            "duplicates": 0,
+            "near_duplicates": 0,
+            "created": 0,
+            "skipped": 0,
+            "analyzed": 0,
+        }
+
+    async def run(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        运行流水线直到所有数据源抓取完毕且新文章分析完成
+        :param limit: 每个数据源的最大文章数
+        :return: 各阶段计数
+        """
+        article_queue: asyncio.Queue = asyncio.Queue()
+        analysis_queue: asyncio.Queue = asyncio.Queue()
+
+        producer = asyncio.create_task(feed_all_sources(article_queue, limit))
+        workers = [
+            asyncio.create_task(self._analysis_worker(analysis_queue))
+            for _ in range(self.analyzer.concurrency)
+        ]
+
+        try:
+            await self._ingest(article_queue, analysis_queue)
+            await producer
+            for _ in workers:
+                await analysis_queue.put(None)
+            timeout = None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+            _, pending = await asyncio.wait(workers, timeout=timeout)
+            if pending:
+                logger.warning(
+                    f"Analysis deadline reached, "
+                    f"{len(self.queued_ids - self.analyzed_ids)} queued articles left unanalyzed"
+                )
+        finally:
+            producer.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.writer.flush()
+            if self.dedup is not None:
+                await asyncio.to_thread(self.dedup.save)
+
+        logger.info(f"Ingestion pipeline finished: {self.stats}")
+        return self.stats
+
+    async def _ingest(self, article_queue: asyncio.Queue, analysis_queue: asyncio.Queue):
+        """消费抓取结果，攒批入库；批次攒满或最早一篇等待超过刷新间隔时入库"""
+        loop = asyncio.get_running_loop()
+        buffer: List[ScrapedArticle] = []
+        flush_at = None
+        finished = False
+
+        while not finished:
+            timeout = None if flush_at is None else max(flush_at - loop.time(), 0)
+            try:
+                article = await asyncio.wait_for(article_queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                article = False
+
+            if article is None:
+                finished = True
+            elif article is not False:
+                self.stats["fetched"] += 1
+                if self._accept(article):
+                    if not buffer:
+                        flush_at = loop.time() + self.flush_interval
+                    buffer.append(article)
+
+            if buffer and (finished or len(buffer) >= self.batch_size or loop.time() >= flush_at):
+                await self._store(buffer, analysis_queue)
+                buffer = []
+                flush_at = None
+
+    def _accept(self, article: ScrapedArticle) -> bool:
+        """去重：同一次运行中重复的URL只保留一篇，并过滤跨数据源、跨天的近似重复"""
+        if article.url in self.seen_urls:
+            self.stats["duplicates"] += 1
+            return False
+        self.seen_urls.add(article.url)
+        if self.dedup is not None and self.dedup.check(article) is not None:
+            self.stats["near_duplicates"] += 1
+            return False
+        return True
+
+    async def _store(self, batch: List[ScrapedArticle], analysis_queue: asyncio.Queue):
+        """批量入库，并把本次新建的文章交给分析阶段"""
+        article_creates = [
+            ArticleCreate(
+                title=a.title,
+                url=a.url,
+                source=a.source,
+                content=a.content,
+                published_at=a.published_at,
+                points=a.points,
+                comments=a.comments
+            )
+            for a in batch
+        ]
+
+        try:
+            async with async_session_maker() as session:
+                result = await ArticleCRUD.batch_create_articles(session, article_creates)
+                stored = await ArticleCRUD.get_articles_by_urls(session, [a.url for a in batch])
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(batch)} articles: {e}")
+            return
+
+        self.stats["created"] += result["created"]
+        self.stats["skipped"] += result["skipped"]
+        mark_seen(result["stored_urls"])
+        if self.dedup is not None:
+            self.dedup.commit(result["stored_urls"])
+
+        created_ids = set(result["created_ids"])
+        for article in stored:
+            # 只分析本次新建的文章，历史文章不会出现在今日简报中
+            if article.id not in created_ids or article.id in self.queued_ids:
+                continue
+            self.queued_ids.add(article.id)
+            await analysis_queue.put(article)
+
+    async def _analysis_worker(self, analysis_queue: asyncio.Queue):
+        """分析工作协程；批量模式下一次取出队列中已就绪的多篇文章"""
+        finished = False
+        while not finished:
+            article = await analysis_queue.get()
+            if article is None:
+                break
+
+            batch = [article]
+            if self.analyzer.batch_mode:
+                while len(batch) < settings.AI_BATCH_MAX_ARTICLES and not analysis_queue.empty():
+                    next_article = analysis_queue.get_nowait()
+                    if next_article is None:
+                        finished = True
+                        break
+                    batch.append(next_article)
+
+            # 截止时取消worker不应打断结果写回
+            results = await self.analyzer.analyze(
+                batch,
+                on_result=lambda a, r: asyncio.shield(self.writer.add_result(a, r))
+            )
+            succeeded = [a.id for a, r in zip(batch, results) if r is not None]
+            self.analyzed_ids.update(succeeded)
+            self.stats["analyzed"] += len(succeeded)
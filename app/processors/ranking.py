@@ -0,0 +1,73 @@
+"""
+本地预排序
+不调用大模型，按时效衰减、数据源权重和互动数据（HN积分/评论、V2EX回复）一次性批量计算排序分，
+只把排名靠前的文章交给大模型分析
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.article import Article
+
+# 没有互动数据的文章（如36氪）使用的中性互动分
+NEUTRAL_ENGAGEMENT = 0.5
+# 评论相对积分的权重，评论更能代表讨论热度
+COMMENT_WEIGHT = 2.0
+
+
+def rank_scores(articles: List[Article], now: Optional[datetime] = None) -> np.ndarray:
+    """
+    计算文章的本地排序分
+    score = 数据源权重 × ((1 - w) × 时效分 + w × 互动分)，w 为 RANKING_ENGAGEMENT_WEIGHT
+    互动分为 log(1 + 积分 + 2×评论) 在同一数据源内按最大值归一化
+    """
+    if not articles:
+        return np.zeros(0)
+    now = now or datetime.utcnow()
+
+    published = [(a.published_at or a.created_at).replace(tzinfo=None) for a in articles]
+    age_hours = np.array([(now - p).total_seconds() for p in published]) / 3600
+    recency = 0.5 ** (np.clip(age_hours, 0, None) / settings.RANKING_HALF_LIFE_HOURS)
+
+    points = np.array([a.points if a.points is not None else np.nan for a in articles], dtype=float)
+    comments = np.array([a.comments if a.comments is not None else np.nan for a in articles], dtype=float)
+    has_engagement = ~(np.isnan(points) & np.isnan(comments))
+    raw = np.log1p(np.nan_to_num(points) + COMMENT_WEIGHT * np.nan_to_num(comments))
+
+    # 各数据源的积分尺度不同，按数据源内的最大值归一化
+    sources, source_index = np.unique([a.source for a in articles], return_inverse=True)
+    source_max = np.zeros(len(sources))
+    np.maximum.at(source_max, source_index, raw)
+    denominator = source_max[source_index]
+    normalized = np.divide(raw, denominator, out=np.zeros_like(raw), where=denominator > 0)
+    engagement = np.where(has_engagement, normalized, NEUTRAL_ENGAGEMENT)
+
+    source_weights = np.array([
+        settings.RANKING_SOURCE_WEIGHTS.get(source, 1.0) for source in sources
+    ])[source_index]
+
+    weight = settings.RANKING_ENGAGEMENT_WEIGHT
+    return source_weights * ((1 - weight) * recency + weight * engagement)
+
+
+def rank_articles(articles: List[Article], now: Optional[datetime] = None) -> List[Article]:
+    """按本地排序分从高到低排序"""
+    scores = rank_scores(articles, now)
+    # 稳定排序，分数相同时保留原顺序
+    order = np.argsort(-scores, kind="stable")
+    return [articles[i] for i in order]
+
+
+def select_top_k(articles: List[Article], k: Optional[int] = None) -> Tuple[List[Article], List[Article]]:
+    """
+    选出排名前K的文章
+    :param k: 默认 AI_ANALYSIS_TOP_K，为0时全部入选
+    :return: (前K篇, 其余文章)，均按排序分从高到低
+    """
+    k = settings.AI_ANALYSIS_TOP_K if k is None else k
+    ranked = rank_articles(articles)
+    if not k:
+        return ranked, []
+    return ranked[:k], ranked[k:]
@@ -0,0 +1,94 @@
+"""
+带截止时间的优先级分析调度
+按本地排序分从高到低分析文章，到达截止时间后停止，未分析的文章交给后台任务补齐
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional
+
+from app.models.article import AIAnalysisResult, Article
+from app.processors.analysis import ConcurrentAnalyzer
+from app.processors.ranking import rank_articles
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeadlineScheduler:
+    """按优先级分析文章，并保证在截止时间前返回"""
+
+    def __init__(self, analyzer: ConcurrentAnalyzer, deadline: Optional[float] = None):
+        """
+        :param analyzer: 执行分析的 ConcurrentAnalyzer
+        :param deadline: 截止时间（time.monotonic() 时刻），为None时不限时
+        """
+        self.analyzer = analyzer
+        self.deadline = deadline
+        self.analyzed: List[Article] = []
+        self.remaining: List[Article] = []
+
+    def prioritize(self, articles: List[Article]) -> List[Article]:
+        """按本地排序分从高到低排序"""
+        return rank_articles(articles)
+
+    async def _worker(
+        self,
+        queue: Deque[List[Article]],
+        on_result: Optional[Callable[[Article, AIAnalysisResult], Awaitable[None]]]
+    ):
+        """依次取出队首（优先级最高）的一批文章进行分析"""
+        while queue:
+            batch = queue.popleft()
+            if len(batch) == 1:
+                results = [await self.analyzer.analyze_one(batch[0])]
+            else:
+                results = await self.analyzer.analyze_batch(batch)
+            for article, result in zip(batch, results):
+                if result is None:
+                    continue
+                self.analyzed.append(article)
+                if on_result is not None:
+                    # 截止时取消worker不应打断结果写回
+                    await asyncio.shield(on_result(article, result))
+
+    async def run(
+        self,
+        articles: List[Article],
+        on_result: Optional[Callable[[Article, AIAnalysisResult], Awaitable[None]]] = None
+    ) -> List[Article]:
+        """
+        按优先级分析文章，直到全部完成或到达截止时间
+        截止时仍在进行的请求被取消，相应文章与未开始、分析失败的文章一起计入 remaining
+        :return: 未完成分析的文章，按优先级排序
+        """
+        ordered = self.prioritize(articles)
+        if self.analyzer.batch_mode and len(ordered) > 1:
+            batches = self.analyzer.ai_service.pack_articles(ordered)
+        else:
+            batches = [[article] for article in ordered]
+        queue: Deque[List[Article]] = deque(batches)
+
+        workers = [
+            asyncio.create_task(self._worker(queue, on_result))
+            for _ in range(min(self.analyzer.concurrency, len(batches)))
+        ]
+        if not workers:
+            return []
+
+        timeout = None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+        _, pending = await asyncio.wait(workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        done_ids = {article.id for article in self.analyzed}
+        self.remaining = [a for a in ordered if a.id not in done_ids]
+        if pending:
+            logger.warning(
+                f"Analysis deadline reached: {len(self.analyzed)}/{len(ordered)} analyzed, "
+                f"{len(self.remaining)} left for background analysis"
+            )
+        else:
+            logger.info(f"Analyzed {len(self.analyzed)}/{len(ordered)} articles before deadline")
+        return self.remaining
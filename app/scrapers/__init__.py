@@ -2,6 +2,8 @@
 爬虫模块初始化
 导出所有爬虫类
 """
+import asyncio
+
 from app.scrapers.v2ex import V2EXScraper
 from app.scrapers.hackernews import HackerNewsScraper
 from app.scrapers.thirty36 import Thirty36Scraper
@@ -27,17 +29,13 @@ async def fetch_all_sources(limit: int = 10) -> dict:
     async def fetch_source(name: str, scraper_class, limit: int):
         """抓取单个数据源"""
         try:
-            scraper = scraper_class()
-            await scraper.__aenter__()
-            articles = await scraper.fetch(limit)
-            await scraper.__aexit__(None, None, None)
-            return articles
+            async with scraper_class() as scraper:
+                return await scraper.fetch(limit)
         except Exception as e:
             logger.error(f"Error fetching {name}: {e}")
             return []
 
     # 并发抓取所有数据源
-    import asyncio
     tasks = []
     scraper_names = []
 
@@ -52,3 +50,34 @@ async def fetch_all_sources(limit: int = 10) -> dict:
         results[name] = articles if articles else []
 
     return results
+
+
+async def feed_all_sources(queue: asyncio.Queue, limit: int = 10):
+    """
+    并发抓取所有数据源，每抓到一篇文章就放入队列
+    全部数据源结束后放入 None 作为结束标记
+    :param queue: 输出队列
+    :param limit: 每个数据源的最大文章数
+    """
+    from app.utils.logger import get_logger
+    logger = get_logger(__name__)
+
+    async def feed_source(name: str, scraper_class):
+        """抓取单个数据源"""
+        count = 0
+        try:
+            async with scraper_class() as scraper:
+                async for article in scraper.stream(limit):
+                    await queue.put(article)
+                    count += 1
+        except Exception as e:
+            logger.error(f"Error streaming {name}: {e}")
+        logger.info(f"Source {name} finished with {count} articles")
+
+    try:
+        await asyncio.gather(*[
+            feed_source(name, scraper_class)
+            for name, scraper_class in SCRAPERS.items()
+        ])
+    finally:
+        await queue.put(None)
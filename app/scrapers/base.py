@@ -5,17 +5,36 @@
 import asyncio
 import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Set
 from datetime import datetime
 import aiohttp
 from bs4 import BeautifulSoup
 
+from app.database import async_session_maker
+from app.database.crud import ArticleCRUD
 from app.models.article import ScrapedArticle
+from app.scrapers.parsing import parse_html
 from app.config import settings
+from app.utils.bloom import might_be_seen
+from app.utils.disk_cache import DiskCache
+from app.utils.http_client import get_http_session
+from app.utils.rate_limiter import get_rate_limiter, parse_retry_after, compute_backoff
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_http_cache: Optional[DiskCache] = None
+
+
+def get_http_cache() -> Optional[DiskCache]:
+    """获取HTTP条件请求缓存，未启用时返回None"""
+    global _http_cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _http_cache is None:
+        _http_cache = DiskCache("http", max_entries=settings.HTTP_CACHE_MAX_ENTRIES)
+    return _http_cache
+
 
 class BaseScraper(ABC):
     """爬虫基类"""
@@ -27,19 +46,17 @@ class BaseScraper(ABC):
         self.max_retries: int = settings.SCRAPER_MAX_RETRIES
         self.delay: float = settings.SCRAPER_DELAY
         self.session: Optional[aiohttp.ClientSession] = None
+        self.headers: dict = {}
 
     async def __aenter__(self):
-        """进入上下文管理器"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout),
-            headers=self._get_headers()
-        )
+        """进入上下文管理器，借用共享连接池"""
+        self.session = get_http_session()
+        self.headers = self._get_headers()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """退出上下文管理器"""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     def _get_headers(self) -> dict:
         """获取请求头"""
@@ -52,24 +69,29 @@ class BaseScraper(ABC):
         }
 
     async def _fetch(self, url: str) -> Optional[str]:
-        """获取页面内容"""
+        """获取页面内容，带ETag/Last-Modified条件请求缓存"""
+        cache = get_http_cache()
+        cached = cache.get(url) if cache else None
+        headers = self._conditional_headers(cached)
+        limiter = get_rate_limiter()
+
         for attempt in range(self.max_retries):
+            wait_time = compute_backoff(attempt, base=self.delay)
             try:
-                # 添加延迟防止请求过快
-                if attempt > 0:
-                    await asyncio.sleep(self.delay * (attempt + 1))
+                await limiter.acquire(url)
 
                 logger.debug(f"Fetching {url} (attempt {attempt + 1}/{self.max_retries})")
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        logger.debug(f"Successfully fetched {url}")
-                        return content
-                    elif response.status == 429:
-                        # 速率限制，增加等待时间
-                        wait_time = 5 * (attempt + 1)
-                        logger.warning(f"Rate limited, waiting {wait_time}s")
-                        await asyncio.sleep(wait_time)
+                async with self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
+                    if response.status == 200 or (response.status == 304 and cached):
+                        return await self._read_body(url, response, cache, cached)
+                    elif response.status in (429, 503):
+                        wait_time = self._rate_limit_wait(url, response, wait_time)
+                        if wait_time is None:
+                            return None
                     else:
                         logger.warning(f"HTTP {response.status} for {url}")
 
@@ -80,12 +102,99 @@ class BaseScraper(ABC):
             except Exception as e:
                 logger.error(f"Unexpected error fetching {url}: {e}")
 
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(wait_time)
+
         logger.error(f"Failed to fetch {url} after {self.max_retries} attempts")
         return None
 
+    async def _read_body(
+        self,
+        url: str,
+        response: aiohttp.ClientResponse,
+        cache: Optional[DiskCache],
+        cached: Optional[dict]
+    ) -> str:
+        """读取成功响应的内容；304时返回缓存内容，200时写回缓存"""
+        if response.status == 304:
+            logger.debug(f"Not modified, serving {url} from cache")
+            cache.set(url, cached)
+            return cached["body"]
+        content = await response.text()
+        logger.debug(f"Successfully fetched {url}")
+        self._store_cache(cache, url, response, content)
+        return content
+
+    def _conditional_headers(self, cached: Optional[dict]) -> dict:
+        """根据缓存的校验头构造条件请求头"""
+        headers = dict(self.headers)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _rate_limit_wait(
+        self,
+        url: str,
+        response: aiohttp.ClientResponse,
+        wait_time: float
+    ) -> Optional[float]:
+        """
+        处理速率限制响应，优先遵循 Retry-After 并暂停该主机的请求
+        :return: 重试前等待的秒数，Retry-After 过长时返回None表示放弃
+        """
+        limiter = get_rate_limiter()
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            if retry_after > settings.SCRAPER_BACKOFF_MAX:
+                logger.warning(f"Retry-After {retry_after:.0f}s too long for {url}, giving up")
+                limiter.pause(url, settings.SCRAPER_BACKOFF_MAX)
+                return None
+            wait_time = retry_after
+        limiter.pause(url, wait_time)
+        logger.warning(f"Rate limited by {url}, waiting {wait_time:.1f}s")
+        return wait_time
+
+    def _store_cache(
+        self,
+        cache: Optional[DiskCache],
+        url: str,
+        response: aiohttp.ClientResponse,
+        content: str
+    ):
+        """缓存带校验头的响应，用于下次条件请求"""
+        if not cache:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        cache.set(url, {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": content,
+        })
+
+    async def filter_seen(self, urls: List[str]) -> Set[str]:
+        """
+        返回已入库的URL，用于跳过详情或正文抓取
+        先查布隆过滤器，可能已存在的URL再用一次批量查询确认，排除误判；查询失败时视为都未入库
+        """
+        candidates = [url for url in urls if might_be_seen(url)]
+        if not candidates:
+            return set()
+        try:
+            async with async_session_maker() as session:
+                return await ArticleCRUD.get_existing_urls(session, candidates)
+        except Exception as e:
+            logger.warning(f"Could not confirm {len(candidates)} seen URLs: {e}")
+            return set()
+
     def _parse_html(self, html: str) -> BeautifulSoup:
         """解析HTML"""
-        return BeautifulSoup(html, "html.parser")
+        return parse_html(html)
 
     @abstractmethod
     async def fetch(self, limit: int = 10) -> List[ScrapedArticle]:
@@ -96,7 +205,15 @@ class BaseScraper(ABC):
         """
         pass
 
+    async def stream(self, limit: int = 10) -> AsyncIterator[ScrapedArticle]:
+        """
+        逐篇产出文章，供流水线在抓取过程中即开始处理
+        默认在 fetch 完成后依次产出，子类可覆盖为边抓取边产出
+        :param limit: 最大文章数
+        """
+        for article in await self.fetch(limit):
+            yield article
+
     async def close(self):
-        """关闭连接"""
-        if self.session:
-            await self.session.close()
+        """归还连接（共享会话由连接池统一关闭）"""
+        self.session = None
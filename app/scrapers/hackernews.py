@@ -1,17 +1,30 @@
 """
 Hacker News 爬虫实现
 """
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 import asyncio
 import json
+import time
 
 from app.scrapers.base import BaseScraper
 from app.models.article import ScrapedArticle
+from app.config import settings
+from app.utils.disk_cache import DiskCache
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_item_cache: Optional[DiskCache] = None
+
+
+def get_item_cache() -> DiskCache:
+    """获取HN条目缓存（按story id持久化）"""
+    global _item_cache
+    if _item_cache is None:
+        _item_cache = DiskCache("hn_items", max_entries=settings.HN_ITEM_CACHE_MAX_ENTRIES)
+    return _item_cache
+
 
 class HackerNewsScraper(BaseScraper):
     """Hacker News爬虫"""
@@ -21,23 +34,21 @@ class HackerNewsScraper(BaseScraper):
         self.name = "hackernews"
         self.base_url = "https://news.ycombinator.com"
         self.api_url = "https://hacker-news.firebaseio.com/v0"
+        self.item_cache = get_item_cache()
+        self.item_ttl = settings.HN_ITEM_CACHE_TTL
 
     async def fetch(self, limit: int = 10) -> List[ScrapedArticle]:
         """抓取Hacker News首页文章"""
         articles = []
 
         try:
-            # 获取Top stories IDs
-            top_stories_url = f"{self.api_url}/topstories.json"
-            content = await self._fetch(top_stories_url)
-
-            if not content:
+            story_ids = await self._drop_known_stories(await self._fetch_story_ids(limit))
+            if not story_ids:
                 return articles
 
-            story_ids = json.loads(content)[:limit]
-
-            # 并发获取每篇文章详情
-            tasks = [self._fetch_story_detail(story_id) for story_id in story_ids]
+            # 限制并发获取文章详情，缓存命中的条目不发请求
+            semaphore = asyncio.Semaphore(settings.HN_MAX_CONCURRENCY)
+            tasks = [self._fetch_story_bounded(semaphore, story_id) for story_id in story_ids]
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
             for result in results:
@@ -53,29 +64,108 @@ class HackerNewsScraper(BaseScraper):
 
         return articles
 
+    async def stream(self, limit: int = 10) -> AsyncIterator[ScrapedArticle]:
+        """按详情获取完成的先后顺序逐篇产出文章"""
+        try:
+            story_ids = await self._drop_known_stories(await self._fetch_story_ids(limit))
+        except Exception as e:
+            logger.error(f"Error fetching Hacker News: {e}")
+            return
+
+        semaphore = asyncio.Semaphore(settings.HN_MAX_CONCURRENCY)
+        tasks = [
+            asyncio.ensure_future(self._fetch_story_bounded(semaphore, story_id))
+            for story_id in story_ids
+        ]
+        count = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    article = await next_done
+                except Exception as e:
+                    logger.error(f"Error fetching story: {e}")
+                    continue
+                if article:
+                    count += 1
+                    yield article
+            logger.info(f"Streamed {count} articles from Hacker News")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_story_ids(self, limit: int) -> List[int]:
+        """获取Top stories IDs"""
+        top_stories_url = f"{self.api_url}/topstories.json"
+        content = await self._fetch(top_stories_url)
+        if not content:
+            return []
+        return json.loads(content)[:limit]
+
+    async def _drop_known_stories(self, story_ids: List[int]) -> List[int]:
+        """
+        去掉已入库的条目，不再刷新其详情
+        只能判断有缓存（含过期缓存）的条目，未缓存的条目不知道文章URL，照常获取
+        """
+        urls = {}
+        for story_id in story_ids:
+            cached = self.item_cache.get(str(story_id))
+            if cached and cached.get("data"):
+                urls[story_id] = cached["data"].get("url", f"{self.base_url}/item?id={story_id}")
+        if not urls:
+            return story_ids
+
+        seen = await self.filter_seen(list(urls.values()))
+        if seen:
+            logger.info(f"Skipping {len(seen)} Hacker News stories already stored")
+        return [story_id for story_id in story_ids if urls.get(story_id) not in seen]
+
+    async def _fetch_story_bounded(
+        self,
+        semaphore: asyncio.Semaphore,
+        story_id: int
+    ) -> Optional[ScrapedArticle]:
+        """在并发上限内获取单篇文章详情"""
+        async with semaphore:
+            return await self._fetch_story_detail(story_id)
+
     async def _fetch_story_detail(self, story_id: int) -> Optional[ScrapedArticle]:
-        """获取单篇文章详情"""
+        """获取单篇文章详情，优先使用条目缓存"""
         try:
+            cache_key = str(story_id)
+            cached = self.item_cache.get(cache_key)
+            if cached and time.time() - cached["fetched_at"] < self.item_ttl:
+                return self._build_article(story_id, cached["data"])
+
             story_url = f"{self.api_url}/item/{story_id}.json"
             content = await self._fetch(story_url)
 
             if not content:
-                return None
+                # 刷新失败时退回到过期的缓存数据，标题、链接等字段不会变化
+                return self._build_article(story_id, cached["data"]) if cached else None
 
             data = json.loads(content)
+            if data:
+                self.item_cache.set(cache_key, {"data": data, "fetched_at": time.time()})
 
-            article = ScrapedArticle(
-                title=data.get("title", ""),
-                url=data.get("url", f"{self.base_url}/item?id={story_id}"),
-                source=self.name,
-                content=None,
-                published_at=datetime.fromtimestamp(data.get("time", 0)) if data.get("time") else None,
-                author=data.get("by"),
-                tags=[data.get("type")] if data.get("type") else []
-            )
-
-            return article
+            return self._build_article(story_id, data)
 
         except Exception as e:
             logger.error(f"Error fetching story {story_id}: {e}")
             return None
+
+    def _build_article(self, story_id: int, data: Optional[dict]) -> Optional[ScrapedArticle]:
+        """将条目JSON转换为文章"""
+        if not data or data.get("deleted") or data.get("dead"):
+            return None
+
+        return ScrapedArticle(
+            title=data.get("title", ""),
+            url=data.get("url", f"{self.base_url}/item?id={story_id}"),
+            source=self.name,
+            content=None,
+            published_at=datetime.fromtimestamp(data.get("time", 0)) if data.get("time") else None,
+            author=data.get("by"),
+            tags=[data.get("type")] if data.get("type") else [],
+            points=data.get("score"),
+            comments=data.get("descendants")
+        )
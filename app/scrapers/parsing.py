@@ -0,0 +1,90 @@
+"""
+HTML解析工具
+可配置的解析后端、轻量的去标签文本清理，以及在线程池/进程池中执行解析
+"""
+import asyncio
+import html as html_lib
+import multiprocessing
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_executor: Optional[Executor] = None
+
+
+def parse_html(html: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    解析HTML
+    :param html: HTML文本
+    :param parser: BeautifulSoup解析后端，默认使用 HTML_PARSER 配置
+    """
+    parser = parser or settings.HTML_PARSER
+    try:
+        return BeautifulSoup(html, parser)
+    except FeatureNotFound:
+        logger.warning(f"HTML parser '{parser}' not available, falling back to html.parser")
+        return BeautifulSoup(html, "html.parser")
+
+
+def strip_tags(text: str) -> str:
+    """去除HTML标签并还原实体，不构建DOM树"""
+    if not text:
+        return ""
+    if "<" in text:
+        text = _SCRIPT_STYLE_RE.sub("", text)
+        text = _COMMENT_RE.sub("", text)
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = html_lib.unescape(text)
+    return text.strip()
+
+
+def _get_executor() -> Optional[Executor]:
+    """按 SCRAPER_PARSE_EXECUTOR 创建解析执行器，inline 时返回None"""
+    global _executor
+    mode = settings.SCRAPER_PARSE_EXECUTOR
+    if mode == "inline":
+        return None
+    if _executor is None:
+        workers = settings.SCRAPER_PARSE_WORKERS
+        if mode == "process" and multiprocessing.current_process().daemon:
+            # Celery prefork 子进程为守护进程，不能再创建子进程；进程池在首次提交任务时才会报错
+            logger.warning("Running in a daemon process, using parser threads instead of processes")
+            mode = "thread"
+        if mode == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parser")
+    return _executor
+
+
+async def run_parser(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    执行解析函数，按配置在当前线程、线程池或进程池中运行
+    进程池模式下 func 及参数、返回值都需要可被pickle
+    """
+    executor = _get_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def shutdown_parser_pool():
+    """关闭解析执行器"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
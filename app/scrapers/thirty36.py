@@ -3,16 +3,94 @@
 """
 from typing import List, Optional
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup, Tag
-import asyncio
+from bs4 import Tag
 
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import parse_html, run_parser
 from app.models.article import ScrapedArticle
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def parse_news_page(html: str, limit: int, base_url: str, source: str) -> List[ScrapedArticle]:
+    """
+    解析36氪快讯列表页
+    定义为模块级函数，便于在解析进程池中执行
+    """
+    articles = []
+    soup = parse_html(html)
+
+    # 36氪的文章项选择器
+    article_items = soup.select(".news-item")[:limit]
+
+    for item in article_items:
+        try:
+            article = _parse_article(item, base_url, source)
+            if article:
+                articles.append(article)
+                logger.debug(f"Parsed article: {article.title[:50]}")
+        except Exception as e:
+            logger.error(f"Error parsing article: {e}")
+            continue
+
+    return articles
+
+
+def _parse_article(item: Tag, base_url: str, source: str) -> Optional[ScrapedArticle]:
+    """解析文章项"""
+    try:
+        # 标题和链接
+        title_elem = item.select_one(".news-title a")
+        if not title_elem:
+            return None
+
+        title = title_elem.get_text(strip=True)
+        url = title_elem.get("href", "")
+
+        if not url.startswith("http"):
+            url = f"{base_url}{url}"
+
+        # 摘要
+        summary_elem = item.select_one(".news-summary")
+        content = summary_elem.get_text(strip=True) if summary_elem else ""
+
+        # 时间
+        time_elem = item.select_one(".news-time")
+        time_text = time_elem.get_text(strip=True) if time_elem else ""
+        published_at = _parse_time(time_text)
+
+        return ScrapedArticle(
+            title=title,
+            url=url,
+            source=source,
+            content=content,
+            published_at=published_at
+        )
+
+    except Exception as e:
+        logger.error(f"Error parsing article item: {e}")
+        return None
+
+
+def _parse_time(time_text: str) -> Optional[datetime]:
+    """解析时间文本"""
+    try:
+        # 处理"2小时前"、"30分钟前"等格式
+        if "小时前" in time_text:
+            hours = int(time_text.replace("小时前", "").strip())
+            return datetime.now() - timedelta(hours=hours)
+        elif "分钟前" in time_text:
+            minutes = int(time_text.replace("分钟前", "").strip())
+            return datetime.now() - timedelta(minutes=minutes)
+        elif "天前" in time_text:
+            days = int(time_text.replace("天前", "").strip())
+            return datetime.now() - timedelta(days=days)
+    except Exception as e:
+        logger.debug(f"Error parsing time '{time_text}': {e}")
+    return None
+
+
 class Thirty36Scraper(BaseScraper):
     """36氪爬虫"""
 
@@ -31,20 +109,8 @@ class Thirty36Scraper(BaseScraper):
             if not content:
                 return articles
 
-            soup = self._parse_html(content)
-
-            # 36氪的文章项选择器
-            article_items = soup.select(".news-item")[:limit]
-
-            for item in article_items:
-                try:
-                    article = self._parse_article(item)
-                    if article:
-                        articles.append(article)
-                        logger.debug(f"Parsed article: {article.title[:50]}")
-                except Exception as e:
-                    logger.error(f"Error parsing article: {e}")
-                    continue
+            # 解析可能较耗CPU，按配置放到线程池/进程池中执行
+            articles = await run_parser(parse_news_page, content, limit, self.base_url, self.name)
 
             logger.info(f"Fetched {len(articles)} articles from 36氪")
 
@@ -52,55 +118,3 @@ class Thirty36Scraper(BaseScraper):
             logger.error(f"Error fetching 36氪: {e}")
 
         return articles
-
-    def _parse_article(self, item: Tag) -> Optional[ScrapedArticle]:
-        """解析文章项"""
-        try:
-            # 标题和链接
-            title_elem = item.select_one(".news-title a")
-            if not title_elem:
-                return None
-
-            title = title_elem.get_text(strip=True)
-            url = title_elem.get("href", "")
-
-            if not url.startswith("http"):
-                url = f"{self.base_url}{url}"
-
-            # 摘要
-            summary_elem = item.select_one(".news-summary")
-            content = summary_elem.get_text(strip=True) if summary_elem else ""
-
-            # 时间
-            time_elem = item.select_one(".news-time")
-            time_text = time_elem.get_text(strip=True) if time_elem else ""
-            published_at = self._parse_time(time_text)
-
-            return ScrapedArticle(
-                title=title,
-                url=url,
-                source=self.name,
-                content=content,
-                published_at=published_at
-            )
-
-        except Exception as e:
-            logger.error(f"Error parsing article item: {e}")
-            return None
-
-    def _parse_time(self, time_text: str) -> Optional[datetime]:
-        """解析时间文本"""
-        try:
-            # 处理"2小时前"、"30分钟前"等格式
-            if "小时前" in time_text:
-                hours = int(time_text.replace("小时前", "").strip())
-                return datetime.now() - timedelta(hours=hours)
-            elif "分钟前" in time_text:
-                minutes = int(time_text.replace("分钟前", "").strip())
-                return datetime.now() - timedelta(minutes=minutes)
-            elif "天前" in time_text:
-                days = int(time_text.replace("天前", "").strip())
-                return datetime.now() - timedelta(days=days)
-        except Exception as e:
-            logger.debug(f"Error parsing time '{time_text}': {e}")
-        return None
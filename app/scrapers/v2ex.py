@@ -6,6 +6,7 @@ from datetime import datetime
 from bs4 import BeautifulSoup, Tag
 
 from app.scrapers.base import BaseScraper
+from app.scrapers.parsing import strip_tags
 from app.models.article import ScrapedArticle
 from app.utils.logger import get_logger
 
@@ -43,7 +44,8 @@ class V2EXScraper(BaseScraper):
                         content=self._clean_text(item.get("content", "")),
                         published_at=datetime.fromtimestamp(item.get("created", 0)),
                         author=item.get("member", {}).get("username"),
-                        tags=item.get("node", {}).get("title", "").split(",") if item.get("node") else []
+                        tags=item.get("node", {}).get("title", "").split(",") if item.get("node") else [],
+                        comments=item.get("replies")
                     )
                     articles.append(article)
                     logger.debug(f"Parsed article: {article.title[:50]}")
@@ -60,7 +62,4 @@ class V2EXScraper(BaseScraper):
 
     def _clean_text(self, text: str) -> str:
         """清理文本"""
-        if not text:
-            return ""
-        from bs4 import BeautifulSoup
-        return BeautifulSoup(text, "html.parser").get_text(strip=True)
+        return strip_tags(text)
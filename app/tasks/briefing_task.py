@@ -2,19 +2,36 @@
 Celery定时任务
 生成每日科技简报
 """
+import asyncio
+import os
+import time
 from datetime import date, datetime
-from celery import Celery, shared_task
+from typing import Any, Dict, List, Optional, Set
+
+from celery import Celery, chord, group, shared_task
 from celery.schedules import crontab
 
 from app.config import settings
-from app.scrapers import fetch_all_sources
+from app.scrapers import SCRAPERS, fetch_all_sources
 from app.ai import get_ai_service
-from app.generators.html_generator import HTMLGenerator
+from app.ai.cache import get_llm_cache
+from app.ai.hedged import HedgedAIService
+from app.ai.limiter import get_retry_budget, reset_retry_budget
+from app.ai.summarizer import MapReduceSummarizer
+from app.processors.analysis import AnalysisWriter, ConcurrentAnalyzer
+from app.processors.dedup import NearDuplicateDetector
+from app.processors.pipeline import IngestionPipeline
+from app.processors.ranking import select_top_k
+from app.processors.scheduler import DeadlineScheduler
+from app.generators.html_generator import get_html_generator
 from app.notifiers.telegram import TelegramNotifier
 from app.notifiers.email import EmailNotifier
 from app.database.crud import ArticleCRUD, BriefingCRUD
-from app.models.article import BriefingData, ArticleCreate
+from app.models.article import Article, ArticleCreate, Briefing, BriefingCreate, BriefingData, ScrapedArticle
 from app.database import async_session_maker
+from app.tasks.checkpoint import RunCheckpoint
+from app.tasks.runtime import run_async
+from app.utils.bloom import mark_seen
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,32 +50,122 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='Asia/Shanghai',
     enable_utc=True,
+    # 子进程初始化（含预热）超过该时间未就绪会被主进程杀掉重启
+    worker_proc_alive_timeout=settings.WORKER_PROC_ALIVE_TIMEOUT,
     # 定时任务配置
     beat_schedule={
         'daily-briefing': {
-            'task': 'app.tasks.briefing_task.generate_daily_briefing',
+            'task': 'generate_daily_briefing',
             'schedule': crontab(hour=settings.BRIEFING_HOUR, minute=settings.BRIEFING_MINUTE),
         },
     }
 )
 
+if settings.BRIEFING_INCREMENTAL:
+    # 全天定期增量采集、分析并更新滚动摘要，定时任务只需合并和渲染
+    celery_app.conf.beat_schedule['incremental-update'] = {
+        'task': 'incremental_update',
+        'schedule': settings.BRIEFING_INCREMENTAL_INTERVAL * 60,
+    }
+
 
 @shared_task(name="generate_daily_briefing")
-def generate_daily_briefing():
+def generate_daily_briefing(force: bool = False):
     """
     生成每日科技简报
     这是主要的定时任务
+    :param force: 忽略当天的检查点，从头生成
     """
-    import asyncio
-    return asyncio.run(_generate_daily_briefing_async())
+    if settings.BRIEFING_CANVAS and not settings.BRIEFING_INCREMENTAL:
+        # 拆分为阶段任务，由多个worker并行执行
+        checkpoint = run_async(RunCheckpoint.load(date.today(), reset=force))
+        result = build_briefing_canvas(checkpoint).apply_async()
+        logger.info(f"Dispatched briefing canvas {result.id}")
+        return {"status": "dispatched", "id": result.id}
+
+    return run_async(_generate_daily_briefing_async(force))
 
 
-async def _generate_daily_briefing_async():
-    """异步执行简报生成任务"""
+async def _generate_daily_briefing_async(force: bool = False):
+    """异步执行简报生成任务，已完成的阶段从检查点恢复"""
     start_time = datetime.now()
+    deadline = None
+    if settings.BRIEFING_ANALYSIS_DEADLINE:
+        deadline = time.monotonic() + settings.BRIEFING_ANALYSIS_DEADLINE
     logger.info("Starting daily briefing generation...")
 
     try:
+        ai_service = get_ai_service()
+        reset_retry_budget()
+        checkpoint = await RunCheckpoint.load(date.today(), reset=force)
+
+        if settings.BRIEFING_INCREMENTAL and checkpoint.is_done("rolling_summary"):
+            # 增量模式：文章已在白天陆续采集分析，只把上次增量之后的新文章并入滚动摘要
+            logger.info("Step 1-4: Using incrementally prepared articles and rolling summary")
+            if not checkpoint.is_done("summary"):
+                rolling = await _update_rolling_summary(ai_service, checkpoint)
+                await checkpoint.complete("summary", _summary_fields(rolling))
+            result = await _publish_briefing(ai_service, checkpoint)
+            result["elapsed"] = (datetime.now() - start_time).total_seconds()
+            logger.info(f"✅ Daily briefing rendered from incremental state in {result['elapsed']:.2f}s")
+            return result
+
+        analyzed_ids: Set[int] = set()
+        if checkpoint.is_done("ingest"):
+            logger.info("Step 1-2: Skipped, articles already ingested")
+        else:
+            analyzed_ids = await _ingest_articles(ai_service, checkpoint, deadline)
+            if analyzed_ids is None:
+                logger.warning("No articles fetched, aborting")
+                return {"status": "failed", "reason": "no articles"}
+
+        # 3-4. AI分析（流式模式下只补充分析流水线未完成的文章，截止时间已过时直接转后台分析）
+        if checkpoint.is_done("analyze"):
+            logger.info("Step 3: Skipped, articles already analyzed")
+        else:
+            logger.info("Step 3: Analyzing articles with AI...")
+            async with async_session_maker() as session:
+                today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
+            pending_articles = [
+                article for article in _select_for_analysis(today_articles)
+                if article.id not in analyzed_ids
+            ]
+            analyzed = await _analyze_with_deadline(ai_service, pending_articles, deadline)
+            await checkpoint.complete("analyze", {"analyzed": analyzed})
+
+        result = await _publish_briefing(ai_service, checkpoint)
+        result["elapsed"] = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ Daily briefing generated successfully in {result['elapsed']:.2f}s")
+        return result
+
+    except Exception as e:
+        logger.error(f"❌ Error generating daily briefing: {e}", exc_info=True)
+        return {
+            "status": "failed",
+            "error": str(e)
+        }
+
+
+async def _ingest_articles(
+    ai_service,
+    checkpoint: RunCheckpoint,
+    deadline: Optional[float]
+) -> Optional[Set[int]]:
+    """
+    采集并入库今日文章，完成后记录 ingest 阶段
+    :return: 流式模式下流水线已分析成功的文章ID；未抓取到任何文章时返回None
+    """
+    analyzed_ids: Set[int] = set()
+    if settings.PIPELINE_STREAMING:
+        # 1-4. 流式采集：抓取、入库与AI分析并行进行
+        logger.info("Step 1: Streaming articles through ingestion pipeline...")
+        pipeline = IngestionPipeline(ai_service, deadline=deadline)
+        stats = await pipeline.run(limit=settings.MAX_ARTICLES_PER_SOURCE)
+        if not stats["fetched"]:
+            return None
+        analyzed_ids = pipeline.analyzed_ids
+        created = stats["created"]
+    else:
         # 1. 数据采集
         logger.info("Step 1: Fetching articles from sources...")
         scraped_data = await fetch_all_sources(limit=settings.MAX_ARTICLES_PER_SOURCE)
@@ -67,57 +174,108 @@ async def _generate_daily_briefing_async():
         for source, articles in scraped_data.items():
             logger.info(f"Fetched {len(articles)} articles from {source}")
             all_articles.extend(articles)
-
         if not all_articles:
-            logger.warning("No articles fetched, aborting")
-            return {"status": "failed", "reason": "no articles"}
+            return None
 
-        # 2. 保存到数据库
+        # 2. 去重并保存到数据库
         logger.info("Step 2: Saving articles to database...")
-        async with async_session_maker() as session:
-            article_creates = [
-                ArticleCreate(
-                    title=a.title,
-                    url=a.url,
-                    source=a.source,
-                    content=a.content,
-                    published_at=a.published_at
-                )
-                for a in all_articles
-            ]
-            result = await ArticleCRUD.batch_create_articles(session, article_creates)
-            logger.info(f"Created {result['created']}, skipped {result['skipped']} articles")
-
-            # 3. 获取今日文章
-            today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
-
-        # 4. AI分析
-        logger.info("Step 3: Analyzing articles with AI...")
-        ai_service = get_ai_service()
-
-        # 为每篇文章生成摘要和关键词
-        for article in today_articles:
-            if not article.summary:
-                try:
-                    analysis = await ai_service.analyze_article(article)
-                    async with async_session_maker() as session:
-                        await ArticleCRUD.update_article_summary(
-                            session,
-                            article.id,
-                            analysis.summary,
-                            analysis.keywords,
-                            analysis.score
-                        )
-                except Exception as e:
-                    logger.error(f"Error analyzing article {article.id}: {e}")
-
-        # 5. 生成总体摘要
+        stored = await _store_articles(all_articles)
+        created = stored["created"]
+
+    await checkpoint.complete("ingest", {"created": created})
+    return analyzed_ids
+
+
+async def _store_articles(articles: List[ScrapedArticle]) -> Dict[str, Any]:
+    """过滤跨数据源、跨天的近似重复文章后批量入库，并记录到已入库URL过滤器"""
+    if not settings.DEDUP_ENABLED:
+        return await _insert_articles(articles)
+
+    # 入库成功后才把文章写入索引，否则数据库短暂不可用时这些文章会在重跑时被当作重复丢弃；
+    # 保存时加锁与其他采集任务写入的索引合并，锁不跨越 await
+    detector = NearDuplicateDetector()
+    articles, duplicates = detector.filter(articles)
+    logger.info(f"Dropped {duplicates} near-duplicate articles")
+    result = await _insert_articles(articles)
+    detector.commit(result["stored_urls"])
+    await asyncio.to_thread(detector.save)
+    return result
+
+
+async def _insert_articles(articles: List[ScrapedArticle]) -> Dict[str, Any]:
+    """批量入库，并把写入成功的URL记录到已入库URL过滤器"""
+    article_creates = [
+        ArticleCreate(
+            title=a.title,
+            url=a.url,
+            source=a.source,
+            content=a.content,
+            published_at=a.published_at,
+            points=a.points,
+            comments=a.comments
+        )
+        for a in articles
+    ]
+    async with async_session_maker() as session:
+        result = await ArticleCRUD.batch_create_articles(session, article_creates)
+    logger.info(f"Created {result['created']}, skipped {result['skipped']} articles")
+    mark_seen(result["stored_urls"])
+    return result
+
+
+def _select_for_analysis(today_articles: List[Article]) -> List[Article]:
+    """只分析本地排序前K篇中尚未分析的文章，按排序分从高到低"""
+    candidates, skipped = select_top_k(today_articles)
+    if skipped:
+        logger.info(f"Pre-ranking kept {len(candidates)} of {len(today_articles)} articles for AI analysis")
+    return [article for article in candidates if not article.summary]
+
+
+async def _analyze_with_deadline(
+    ai_service,
+    articles: List[Article],
+    deadline: Optional[float],
+    defer_remaining: bool = True
+) -> int:
+    """
+    按排序优先分析，结果攒批写回；到达截止时间后剩余文章转后台任务
+    :param deadline: time.monotonic() 时刻，为None时不限时
+    :param defer_remaining: 是否把剩余文章交给后台任务
+    :return: 完成分析的文章数
+    """
+    async with AnalysisWriter() as writer:
+        scheduler = DeadlineScheduler(ConcurrentAnalyzer(ai_service), deadline=deadline)
+        remaining = await scheduler.run(articles, on_result=writer.add_result)
+    if remaining and defer_remaining:
+        try:
+            analyze_articles.delay([article.id for article in remaining])
+        except Exception as e:
+            logger.error(f"Failed to schedule background analysis: {e}")
+    return len(scheduler.analyzed)
+
+
+async def _publish_briefing(ai_service, checkpoint: RunCheckpoint) -> Dict[str, Any]:
+    """生成总体摘要、HTML页面和简报记录，并推送通知；已完成的阶段直接使用检查点中的输出"""
+    # 读取今日文章，带上分析后的摘要和评分
+    async with async_session_maker() as session:
+        today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
+
+    # 5. 生成总体摘要
+    if checkpoint.is_done("summary"):
+        logger.info("Step 4: Using stored overall summary")
+        summary_result = checkpoint.output("summary")
+    else:
         logger.info("Step 4: Generating overall summary...")
-        summary_result = await ai_service.summarize_articles(today_articles)
-
-        # 6. 生成HTML页面
+        summary_result = await MapReduceSummarizer(ai_service).summarize(today_articles)
+        await checkpoint.complete("summary", summary_result)
+
+    # 6. 生成HTML页面
+    html_path = (checkpoint.output("render") or {}).get("html_path")
+    if html_path and os.path.exists(html_path):
+        logger.info("Step 5: Using rendered HTML page")
+    else:
         logger.info("Step 5: Generating HTML page...")
-        generator = HTMLGenerator()
+        generator = get_html_generator()
 
         briefing_data = BriefingData(
             date=date.today(),
@@ -127,72 +285,343 @@ async def _generate_daily_briefing_async():
         )
 
         html_path = generator.generate_briefing(briefing_data)
-
-        # 7. 保存简报记录
-        logger.info("Step 6: Saving briefing record...")
-        async with async_session_maker() as session:
-            briefing = await BriefingCRUD.create_briefing(
-                session,
-                {
-                    "date": date.today(),
-                    "total_articles": len(today_articles),
-                    "html_path": html_path
-                }
+        await checkpoint.complete("render", {"html_path": html_path})
+
+    # 7. 保存简报记录（重跑时更新当天的记录）
+    logger.info("Step 6: Saving briefing record...")
+    async with async_session_maker() as session:
+        briefing = await BriefingCRUD.upsert_briefing(
+            session,
+            BriefingCreate(
+                date=date.today(),
+                total_articles=len(today_articles),
+                html_path=html_path
             )
+        )
 
-        # 8. 推送通知
-        logger.info("Step 7: Sending notifications...")
-
-        # Telegram
-        if settings.TELEGRAM_BOT_TOKEN:
-            telegram_notifier = TelegramNotifier()
-            await telegram_notifier.send_briefing(
-                title=f"{settings.BRIEFING_TITLE} - {date.today()}",
-                summary=summary_result.get("summary", "")[:200],
-                url=html_path,
-                articles_count=len(today_articles)
-            )
+    # 8. 推送通知，发送成功后记录，重跑时不重复发送
+    logger.info("Step 7: Sending notifications...")
+    title = f"{settings.BRIEFING_TITLE} - {date.today()}"
+    summary = summary_result.get("summary", "")[:200]
 
-        # Email
-        if settings.SMTP_HOST:
-            email_notifier = EmailNotifier()
-            await email_notifier.send_briefing(
-                title=f"{settings.BRIEFING_TITLE} - {date.today()}",
-                summary=summary_result.get("summary", "")[:200],
-                url=html_path,
-                articles_count=len(today_articles)
-            )
+    # Telegram
+    if settings.TELEGRAM_BOT_TOKEN and not checkpoint.is_done("notify_telegram"):
+        telegram_notifier = TelegramNotifier()
+        sent = await telegram_notifier.send_briefing(
+            title=title,
+            summary=summary,
+            url=html_path,
+            articles_count=len(today_articles)
+        )
+        if sent:
+            await _mark_notified(checkpoint, briefing, "notify_telegram", sent_telegram=True)
+
+    # Email
+    if settings.SMTP_HOST and not checkpoint.is_done("notify_email"):
+        email_notifier = EmailNotifier()
+        sent = await email_notifier.send_briefing(
+            title=title,
+            summary=summary,
+            url=html_path,
+            articles_count=len(today_articles)
+        )
+        if sent:
+            await _mark_notified(checkpoint, briefing, "notify_email", sent_email=True)
+
+    _log_ai_stats(ai_service)
+
+    return {
+        "status": "success",
+        "articles_count": len(today_articles),
+        "html_path": html_path
+    }
+
+
+async def _mark_notified(checkpoint: RunCheckpoint, briefing: Briefing, stage: str, **status):
+    """记录通知已发送到简报记录和检查点"""
+    async with async_session_maker() as session:
+        await BriefingCRUD.update_briefing_status(session, briefing.id, **status)
+    await checkpoint.complete(stage)
+
+
+def _summary_fields(summary_result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "summary": summary_result.get("summary", ""),
+        "trending_topics": summary_result.get("trending_topics", []),
+        "category": summary_result.get("category", "科技"),
+    }
+
+
+async def _update_rolling_summary(ai_service, checkpoint: RunCheckpoint) -> Dict[str, Any]:
+    """
+    把尚未摘要过的今日文章并入滚动摘要，只对新增文章调用大模型
+    :return: 更新后的滚动摘要，含已覆盖的文章ID
+    """
+    rolling = checkpoint.output("rolling_summary") or {}
+    summarized_ids = set(rolling.get("article_ids", []))
+
+    async with async_session_maker() as session:
+        today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
+    new_articles = [article for article in today_articles if article.id not in summarized_ids]
+    if not new_articles:
+        return rolling
+
+    summarizer = MapReduceSummarizer(ai_service)
+    new_summary = await summarizer.summarize(new_articles)
+    if not new_summary.get("summary") or new_summary["summary"] == "无法生成摘要":
+        # 本次失败的文章留到下次再并入
+        logger.warning(f"Could not summarize {len(new_articles)} new articles, keeping previous rolling summary")
+        return rolling
+    if rolling.get("summary"):
+        merged = await summarizer.merge([_summary_fields(rolling), new_summary], len(today_articles))
+    else:
+        merged = new_summary
+
+    rolling = {
+        **_summary_fields(merged),
+        "article_ids": sorted(summarized_ids | {article.id for article in new_articles}),
+    }
+    await checkpoint.complete("rolling_summary", rolling)
+    logger.info(f"Rolling summary updated with {len(new_articles)} new articles")
+    return rolling
 
-        elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(f"✅ Daily briefing generated successfully in {elapsed:.2f}s")
 
+@shared_task(name="incremental_update")
+def incremental_update():
+    """增量采集并分析新文章，更新当天的滚动摘要"""
+    return run_async(_incremental_update_async())
+
+
+async def _incremental_update_async() -> Dict[str, Any]:
+    try:
+        checkpoint = await RunCheckpoint.load(date.today())
+        if checkpoint.is_done("render"):
+            # 当天简报已生成，之后的文章不会再进入今天的简报
+            return {"status": "skipped", "reason": "briefing already rendered"}
+
+        ai_service = get_ai_service()
+        reset_retry_budget()
+
+        scraped_data = await fetch_all_sources(limit=settings.MAX_ARTICLES_PER_SOURCE)
+        articles = [article for source_articles in scraped_data.values() for article in source_articles]
+        stored = await _store_articles(articles) if articles else {"created": 0}
+
+        async with async_session_maker() as session:
+            today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
+        # 分析限时在一个增量周期内，未完成的留给下一次增量
+        deadline = time.monotonic() + settings.BRIEFING_INCREMENTAL_INTERVAL * 60 * 0.8
+        analyzed = await _analyze_with_deadline(
+            ai_service,
+            _select_for_analysis(today_articles),
+            deadline,
+            defer_remaining=False
+        )
+
+        rolling = await _update_rolling_summary(ai_service, checkpoint)
         return {
             "status": "success",
-            "articles_count": len(today_articles),
-            "html_path": html_path,
-            "elapsed": elapsed
+            "created": stored["created"],
+            "analyzed": analyzed,
+            "summarized": len(rolling.get("article_ids", []))
         }
+    except Exception as e:
+        logger.error(f"Error in incremental update: {e}", exc_info=True)
+        return {"status": "failed", "error": str(e)}
+
+
+def _log_ai_stats(ai_service):
+    """记录本进程的大模型缓存、对冲和重试统计"""
+    llm_cache = get_llm_cache()
+    if llm_cache:
+        logger.info(f"LLM cache stats: {llm_cache.stats()}")
+    if isinstance(ai_service, HedgedAIService):
+        logger.info(f"AI hedging stats: {ai_service.stats}")
+    retry_budget = get_retry_budget()
+    logger.info(f"LLM retries used: {retry_budget.used}/{retry_budget.total}")
+
+
+# 阶段任务：按数据源并行采集 -> 规划分析 -> 按文章ID分块并行分析 -> 摘要、渲染与推送
+# 任务之间只传递文章ID，文章内容始终从数据库读取
+
+def build_briefing_canvas(checkpoint: RunCheckpoint):
+    """
+    构建简报生成的 chord：各数据源采集完成后规划分析任务
+    与同步路径一样跳过检查点中已完成的采集、分析阶段
+    """
+    if checkpoint.is_done("analyze"):
+        logger.info("Ingest and analysis already done, finalizing briefing")
+        return finalize_briefing.s([])
+
+    deadline_at = None
+    if settings.BRIEFING_ANALYSIS_DEADLINE:
+        deadline_at = time.time() + settings.BRIEFING_ANALYSIS_DEADLINE
+    if checkpoint.is_done("ingest"):
+        logger.info("Articles already ingested, planning analysis")
+        return plan_analysis.s([], deadline_at=deadline_at)
+    return chord(
+        group(scrape_source.s(name) for name in SCRAPERS),
+        plan_analysis.s(deadline_at=deadline_at)
+    )
+
+
+def _monotonic_deadline(deadline_at: Optional[float]) -> Optional[float]:
+    """把跨进程传递的时间戳截止时间换算为本进程的 time.monotonic() 时刻"""
+    if deadline_at is None:
+        return None
+    return time.monotonic() + (deadline_at - time.time())
+
+
+@shared_task(name="scrape_source")
+def scrape_source(source: str):
+    """采集单个数据源并入库，返回新建文章ID"""
+    return run_async(_scrape_source_async(source))
+
+
+async def _scrape_source_async(source: str) -> Dict[str, Any]:
+    try:
+        async with SCRAPERS[source]() as scraper:
+            articles = await scraper.fetch(limit=settings.MAX_ARTICLES_PER_SOURCE)
+        logger.info(f"Fetched {len(articles)} articles from {source}")
+        if not articles:
+            return {"source": source, "fetched": 0, "created_ids": []}
+        result = await _store_articles(articles)
+        return {"source": source, "fetched": len(articles), "created_ids": result["created_ids"]}
+    except Exception as e:
+        # 单个数据源失败不影响 chord 回调
+        logger.error(f"Error scraping {source}: {e}", exc_info=True)
+        return {"source": source, "fetched": 0, "created_ids": [], "error": str(e)}
 
+
+@shared_task(name="plan_analysis", bind=True)
+def plan_analysis(
+    self,
+    scrape_results: List[Dict[str, Any]],
+    deadline_at: Optional[float] = None
+):
+    """
+    chord回调：记录采集阶段完成，挑选待分析文章，
+    按 BRIEFING_ANALYSIS_CHUNK_SIZE 分块扇出分析任务，全部完成后执行 finalize_briefing
+    :param scrape_results: 各数据源的采集结果，采集已在之前的运行中完成时为空列表
+    """
+    if scrape_results:
+        if not any(r.get("fetched") for r in scrape_results):
+            logger.warning("No articles fetched, aborting")
+            return {"status": "failed", "reason": "no articles"}
+        created = sum(len(r.get("created_ids", [])) for r in scrape_results)
+        logger.info(f"Scraping finished, {created} new articles")
+        run_async(_complete_stage("ingest", {"created": created}))
+
+    article_ids = run_async(_plan_analysis_async())
+    size = settings.BRIEFING_ANALYSIS_CHUNK_SIZE
+    chunks = [article_ids[i:i + size] for i in range(0, len(article_ids), size)]
+    logger.info(f"Analyzing {len(article_ids)} articles in {len(chunks)} tasks")
+
+    if not chunks:
+        return self.replace(finalize_briefing.s([]))
+    # 本次运行的重试预算按块均分，各分析任务在不同进程中各自计数
+    retry_budget = -(-settings.AI_RETRY_BUDGET // len(chunks))
+    return self.replace(chord(
+        group(
+            analyze_chunk.s(chunk, deadline_at=deadline_at, retry_budget=retry_budget)
+            for chunk in chunks
+        ),
+        finalize_briefing.s()
+    ))
+
+
+async def _complete_stage(stage: str, output: Dict[str, Any]):
+    """在阶段任务中记录当天检查点的阶段完成"""
+    checkpoint = await RunCheckpoint.load(date.today())
+    await checkpoint.complete(stage, output)
+
+
+async def _plan_analysis_async() -> List[int]:
+    async with async_session_maker() as session:
+        today_articles = await ArticleCRUD.get_articles_by_date(session, date.today())
+    return [article.id for article in _select_for_analysis(today_articles)]
+
+
+@shared_task(name="analyze_chunk")
+def analyze_chunk(
+    article_ids: List[int],
+    deadline_at: Optional[float] = None,
+    retry_budget: Optional[int] = None
+):
+    """分析一块文章，到达截止时间后剩余文章转后台任务"""
+    return run_async(_analyze_chunk_async(article_ids, deadline_at, retry_budget))
+
+
+async def _analyze_chunk_async(
+    article_ids: List[int],
+    deadline_at: Optional[float],
+    retry_budget: Optional[int] = None
+) -> int:
+    try:
+        reset_retry_budget(retry_budget)
+        async with async_session_maker() as session:
+            articles = await ArticleCRUD.get_articles_by_ids(session, article_ids)
+        articles = [article for article in articles if not article.summary]
+        return await _analyze_with_deadline(get_ai_service(), articles, _monotonic_deadline(deadline_at))
     except Exception as e:
-        logger.error(f"❌ Error generating daily briefing: {e}", exc_info=True)
-        return {
-            "status": "failed",
-            "error": str(e)
-        }
+        # 分析失败不应阻止简报生成
+        logger.error(f"Error analyzing chunk of {len(article_ids)} articles: {e}", exc_info=True)
+        return 0
+
+
+@shared_task(name="finalize_briefing")
+def finalize_briefing(analyzed_counts: List[int]):
+    """chord回调：记录分析阶段完成，生成摘要、HTML页面和简报记录，并推送通知"""
+    logger.info(f"Analysis finished, {sum(analyzed_counts)} articles analyzed")
+    return run_async(_finalize_briefing_async(analyzed_counts))
+
+
+async def _finalize_briefing_async(analyzed_counts: List[int]) -> Dict[str, Any]:
+    # 检查点已在派发 canvas 时按 force 重置，这里只读取
+    checkpoint = await RunCheckpoint.load(date.today())
+    if not checkpoint.is_done("analyze"):
+        await checkpoint.complete("analyze", {"analyzed": sum(analyzed_counts)})
+    return await _publish_briefing(get_ai_service(), checkpoint)
+
+
+@shared_task(name="analyze_articles")
+def analyze_articles(article_ids: List[int]):
+    """后台分析简报截止时间前未完成分析的文章"""
+    return run_async(_analyze_articles_async(article_ids))
+
+
+async def _analyze_articles_async(article_ids: List[int]):
+    """异步执行后台分析"""
+    reset_retry_budget()
+    async with async_session_maker() as session:
+        articles = await ArticleCRUD.get_articles_by_ids(session, article_ids)
+    articles = [article for article in articles if not article.summary]
+    logger.info(f"Background analysis of {len(articles)} articles")
+
+    async with AnalysisWriter() as writer:
+        analyzer = ConcurrentAnalyzer(get_ai_service())
+        results = await analyzer.analyze(articles, on_result=writer.add_result)
+
+    return {
+        "status": "success",
+        "analyzed": sum(1 for r in results if r is not None),
+        "total": len(articles)
+    }
 
 
 @shared_task(name="manual_trigger_briefing")
-def manual_trigger_briefing():
-    """手动触发简报生成"""
+def manual_trigger_briefing(force: bool = False):
+    """
+    手动触发简报生成
+    :param force: 忽略当天的检查点，从头生成
+    """
     logger.info("Manual briefing generation triggered")
-    return generate_daily_briefing()
+    return generate_daily_briefing(force)
 
 
 @shared_task(name="test_notification")
 def test_notification():
     """测试通知推送"""
-    import asyncio
-    return asyncio.run(_test_notification_async())
+    return run_async(_test_notification_async())
 
 
 async def _test_notification_async():
@@ -0,0 +1,49 @@
+"""
+简报生成检查点
+每个阶段完成后记录输出，失败重跑时跳过已完成的阶段
+"""
+from datetime import date
+from typing import Any, Dict, Optional
+
+from app.database import async_session_maker
+from app.database.crud import BriefingRunCRUD
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RunCheckpoint:
+    """某一天简报运行的阶段检查点"""
+
+    def __init__(self, run_date: date, completed: Optional[Dict[str, Any]] = None):
+        self.run_date = run_date
+        self.completed: Dict[str, Any] = completed or {}
+
+    @classmethod
+    async def load(cls, run_date: date, reset: bool = False) -> "RunCheckpoint":
+        """
+        载入已完成的阶段
+        :param reset: 为True时清除已有检查点，从头运行
+        """
+        async with async_session_maker() as session:
+            if reset:
+                await BriefingRunCRUD.clear_stages(session, run_date)
+                completed = {}
+            else:
+                completed = await BriefingRunCRUD.get_completed_stages(session, run_date)
+        if completed:
+            logger.info(f"Resuming briefing run for {run_date}, completed stages: {sorted(completed)}")
+        return cls(run_date, completed)
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self.completed
+
+    def output(self, stage: str) -> Any:
+        """已完成阶段的输出"""
+        return self.completed.get(stage)
+
+    async def complete(self, stage: str, output: Optional[Dict[str, Any]] = None):
+        """记录阶段完成"""
+        async with async_session_maker() as session:
+            await BriefingRunCRUD.complete_stage(session, self.run_date, stage, output)
+        self.completed[stage] = output
@@ -0,0 +1,101 @@
+"""
+Celery worker 的异步运行时
+每个worker进程一个常驻事件循环（运行在后台线程中），所有任务的协程都提交到该循环执行，
+数据库连接池、HTTP连接池和AI客户端因此可以跨任务复用；进程退出时统一释放
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """获取本进程的常驻事件循环，首次调用时启动"""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="async-runtime", daemon=True)
+            _thread.start()
+            logger.info("Started worker event loop")
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """
+    在常驻事件循环中执行协程并等待结果，供同步的Celery任务调用
+    :param timeout: 等待秒数，超时后取消协程并抛出 TimeoutError
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def _dispose_resources():
+    """释放事件循环上绑定的连接池等资源"""
+    from app.database import engine
+    from app.scrapers.parsing import shutdown_parser_pool
+    from app.utils.http_client import close_http_session
+
+    await close_http_session()
+    await engine.dispose()
+    shutdown_parser_pool()
+
+
+def shutdown_runtime():
+    """释放资源并停止事件循环"""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+    if loop is None or loop.is_closed():
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(_dispose_resources(), loop).result(timeout=30)
+    except Exception as e:
+        logger.warning(f"Error disposing worker resources: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=10)
+    loop.close()
+    logger.info("Worker event loop stopped")
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    """prefork子进程启动：丢弃从父进程继承的连接，启动本进程的事件循环，按配置预热"""
+    from app.config import settings
+    from app.database import engine
+
+    # 父进程中可能已建立的连接不能跨进程使用
+    engine.sync_engine.dispose(close=False)
+    get_loop()
+
+    if settings.WORKER_WARMUP:
+        from app.tasks.warmup import warm_up
+        warm_up()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs):
+    shutdown_runtime()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs):
+    # solo / threads 池没有子进程，在worker退出时释放
+    shutdown_runtime()
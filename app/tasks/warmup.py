@@ -0,0 +1,95 @@
+"""
+Celery worker 预热
+worker进程启动时预先导入AI服务商SDK、建立数据库连接和HTTP会话、编译模板，
+避免这些开销落在部署或扩容后的第一次简报任务上；由 WORKER_WARMUP 开启
+预热在 worker_process_init 中同步执行，网络相关阶段带超时，
+整体耗时需小于 WORKER_PROC_ALIVE_TIMEOUT，否则子进程会被反复杀掉重启
+"""
+import concurrent.futures
+import time
+from typing import Callable, Dict
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _warm_ai_service():
+    """导入已配置的服务商SDK并创建客户端"""
+    from app.ai import get_ai_service
+    get_ai_service()
+
+
+def _warm_database():
+    """在常驻事件循环上建立连接并验证可用"""
+    from app.database import engine
+    from app.tasks.runtime import run_async
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    run_async(ping(), timeout=settings.WORKER_WARMUP_STAGE_TIMEOUT)
+
+
+def _warm_http_session():
+    """在常驻事件循环上创建共享HTTP会话"""
+    from app.tasks.runtime import run_async
+    from app.utils.http_client import get_http_session
+
+    async def create():
+        get_http_session()
+
+    run_async(create(), timeout=settings.WORKER_WARMUP_STAGE_TIMEOUT)
+
+
+def _warm_templates():
+    from app.generators.html_generator import get_html_generator
+    get_html_generator().precompile()
+
+
+def _warm_caches():
+    """创建各磁盘缓存目录并映射已入库URL过滤器文件；磁盘缓存按需读取，这里不预先载入条目"""
+    from app.ai.cache import get_llm_cache
+    from app.scrapers.base import get_http_cache
+    from app.scrapers.hackernews import get_item_cache
+    from app.utils.bloom import get_seen_url_filter
+
+    get_llm_cache()
+    get_http_cache()
+    get_item_cache()
+    get_seen_url_filter()
+
+
+STAGES: Dict[str, Callable[[], None]] = {
+    "ai_service": _warm_ai_service,
+    "database": _warm_database,
+    "http_session": _warm_http_session,
+    "templates": _warm_templates,
+    "caches": _warm_caches,
+}
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    依次执行各预热阶段，单个阶段失败只记录警告，不影响worker启动
+    :return: 各阶段耗时（毫秒）
+    """
+    timings = {}
+    started = time.perf_counter()
+    for name, stage in STAGES.items():
+        stage_started = time.perf_counter()
+        try:
+            stage()
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"Worker warm-up stage {name} timed out, skipped")
+        except Exception as e:
+            logger.warning(f"Worker warm-up stage {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - stage_started) * 1000, 1)
+
+    total = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Worker warm-up finished in {total}ms, stages: {timings}")
+    return timings
@@ -0,0 +1,126 @@
+"""
+基于mmap文件的布隆过滤器
+记录已入库文章的规范化URL，爬虫抓取详情前先检查，跳过已知条目；
+判断为已存在的结果可能是误判，需要时再用一次批量数据库查询确认
+"""
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.config import settings
+from app.utils.helpers import canonicalize_url, generate_url_hash
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 文件头：已添加的元素数、位数组长度、哈希函数个数
+_HEADER = struct.Struct("<QQI")
+
+
+class BloomFilter:
+    """持久化到文件的布隆过滤器，多个进程可映射同一文件"""
+
+    def __init__(self, path: Path, capacity: int, error_rate: float):
+        """
+        :param path: 位数组文件路径
+        :param capacity: 预期元素数，超过后清空重建
+        :param error_rate: 期望误判率
+        """
+        self.path = Path(path)
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._size = _HEADER.size + (self.num_bits + 7) // 8
+        self._mmap = self._open()
+
+    def _open(self) -> mmap.mmap:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != self._size:
+                # 新文件或参数已改变，重建
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._size)
+            mapped = mmap.mmap(fd, self._size)
+        finally:
+            os.close(fd)
+
+        count, num_bits, num_hashes = _HEADER.unpack_from(mapped, 0)
+        if (num_bits, num_hashes) != (self.num_bits, self.num_hashes):
+            mapped[:] = bytes(self._size)
+            _HEADER.pack_into(mapped, 0, 0, self.num_bits, self.num_hashes)
+        return mapped
+
+    @property
+    def count(self) -> int:
+        return _HEADER.unpack_from(self._mmap, 0)[0]
+
+    def _positions(self, key: str) -> List[int]:
+        """由一个128位哈希派生 k 个位置（双重哈希）"""
+        digest = int(generate_url_hash(key), 16)
+        h1, h2 = digest >> 64, (digest & ((1 << 64) - 1)) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        mapped = self._mmap
+        offset = _HEADER.size
+        return all(mapped[offset + p // 8] & (1 << (p % 8)) for p in self._positions(key))
+
+    def add(self, key: str):
+        """添加元素；多进程并发写同一字节时可能丢失一位，只会导致漏判为未见过"""
+        if self.count >= self.capacity:
+            logger.info(f"Bloom filter {self.path.name} reached capacity {self.capacity}, resetting")
+            self.clear()
+        mapped = self._mmap
+        offset = _HEADER.size
+        for p in self._positions(key):
+            mapped[offset + p // 8] |= 1 << (p % 8)
+        _HEADER.pack_into(mapped, 0, self.count + 1, self.num_bits, self.num_hashes)
+
+    def clear(self):
+        self._mmap[_HEADER.size:] = bytes(self._size - _HEADER.size)
+        _HEADER.pack_into(self._mmap, 0, 0, self.num_bits, self.num_hashes)
+
+    def flush(self):
+        self._mmap.flush()
+
+    def close(self):
+        if not self._mmap.closed:
+            self._mmap.flush()
+            self._mmap.close()
+
+
+_seen_filter: Optional[BloomFilter] = None
+
+
+def get_seen_url_filter() -> Optional[BloomFilter]:
+    """获取已入库URL的布隆过滤器，未启用时返回None"""
+    global _seen_filter
+    if not settings.SEEN_URL_FILTER_ENABLED:
+        return None
+    if _seen_filter is None:
+        _seen_filter = BloomFilter(
+            Path(settings.CACHE_DIR) / "seen_urls.bloom",
+            capacity=settings.SEEN_URL_FILTER_CAPACITY,
+            error_rate=settings.SEEN_URL_FILTER_ERROR_RATE
+        )
+    return _seen_filter
+
+
+def might_be_seen(url: str) -> bool:
+    """URL是否可能已入库；为False时一定未入库"""
+    seen_filter = get_seen_url_filter()
+    return seen_filter is not None and canonicalize_url(url) in seen_filter
+
+
+def mark_seen(urls: Iterable[str]):
+    """记录已入库的URL"""
+    seen_filter = get_seen_url_filter()
+    if seen_filter is None:
+        return
+    for url in urls:
+        seen_filter.add(canonicalize_url(url))
+    seen_filter.flush()
@@ -0,0 +1,113 @@
+"""
+磁盘缓存
+以JSON文件保存键值对，支持过期时间和按最近访问时间淘汰
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import settings
+from app.utils.helpers import generate_url_hash
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskCache:
+    """基于文件的LRU缓存，每个键对应一个JSON文件"""
+
+    def __init__(self, namespace: str, max_entries: int = 1000, ttl: Optional[float] = None):
+        """
+        :param namespace: 缓存命名空间，对应 CACHE_DIR 下的子目录
+        :param max_entries: 最大条目数，超出后淘汰最久未访问的条目
+        :param ttl: 过期时间（秒），None 表示不过期
+        """
+        self.directory = Path(settings.CACHE_DIR) / namespace
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._count: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{generate_url_hash(key)}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存，未命中或已过期返回None"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Corrupt cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        if entry.get("key") != key:
+            return None
+        if self.ttl is not None and time.time() - entry.get("stored_at", 0) > self.ttl:
+            self._remove(path)
+            return None
+
+        # 更新访问时间，用于LRU淘汰
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: str, value: Any):
+        """写入缓存"""
+        path = self._path(key)
+        is_new = not path.exists()
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "stored_at": time.time(), "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Error writing cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+
+        if is_new and self._count is not None:
+            self._count += 1
+        self._evict()
+
+    def delete(self, key: str):
+        """删除缓存"""
+        self._remove(self._path(key))
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+            if self._count is not None and path.suffix == ".json":
+                self._count -= 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Error removing cache entry {path}: {e}")
+
+    def _evict(self):
+        """超出容量时淘汰最久未访问的条目，一次淘汰到容量的90%"""
+        if self._count is None:
+            self._count = sum(1 for _ in self.directory.glob("*.json"))
+        if self._count <= self.max_entries:
+            return
+
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries.sort()
+
+        target = int(self.max_entries * 0.9)
+        for _, path in entries[:max(len(entries) - target, 0)]:
+            self._remove(path)
+        self._count = min(len(entries), target)
+        logger.debug(f"Evicted cache entries in {self.directory}, {self._count} left")
@@ -4,6 +4,13 @@
 import hashlib
 from typing import Optional
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 不影响内容的跟踪参数
+TRACKING_PARAMS = {
+    "ref", "ref_src", "source", "from", "spm", "share", "fbclid", "gclid", "yclid",
+    "mc_cid", "mc_eid", "igshid", "_hsenc", "_hsmi",
+}
 
 
 def generate_url_hash(url: str) -> str:
@@ -11,6 +18,30 @@ def generate_url_hash(url: str) -> str:
     return hashlib.md5(url.encode()).hexdigest()
 
 
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL：http统一为https、小写域名、去掉 www. 前缀、片段和跟踪参数，查询参数排序，去掉末尾斜杠
+    同一内容带不同跟踪参数的URL规范化后相同
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme in ("", "http"):
+        scheme = "https"
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
 def format_datetime(dt: Optional[datetime], format_str: str = "%Y-%m-%d %H:%M") -> str:
     """格式化日期时间"""
     if not dt:
@@ -0,0 +1,58 @@
+"""
+共享HTTP客户端
+每个事件循环维护一个带连接池的 aiohttp.ClientSession，供爬虫和AI服务复用
+"""
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 事件循环 -> 共享会话
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """创建带连接池配置的会话"""
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=settings.SCRAPER_TIMEOUT),
+    )
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    获取当前事件循环的共享会话
+    会话由本模块管理，调用方不要自行关闭
+    """
+    loop = asyncio.get_running_loop()
+
+    # 清理已关闭事件循环遗留的会话
+    for stale_loop in [known for known in _sessions if known.is_closed()]:
+        _sessions.pop(stale_loop, None)
+
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _create_session()
+        _sessions[loop] = session
+        logger.debug("Created shared HTTP session")
+    return session
+
+
+async def close_http_session():
+    """关闭当前事件循环的共享会话"""
+    loop = asyncio.get_running_loop()
+    session: Optional[aiohttp.ClientSession] = _sessions.pop(loop, None)
+    if session and not session.closed:
+        await session.close()
+        logger.debug("Closed shared HTTP session")
@@ -0,0 +1,112 @@
+"""
+按主机限速
+令牌桶限流 + 支持 Retry-After 的指数退避
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    令牌桶
+    不使用锁：在单线程事件循环中，取令牌和扣减之间没有 await，
+    欠下的令牌按速率换算成等待时间，因此可以跨事件循环复用
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    async def acquire(self):
+        """取一个令牌，不足时等待"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        wait = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """暂停该主机的请求（如收到429）"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """按主机维护令牌桶"""
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            rate, burst = settings.SCRAPER_RATE_LIMIT, settings.SCRAPER_RATE_BURST
+            if host in settings.SCRAPER_HOST_RATE_LIMITS:
+                rate, burst = settings.SCRAPER_HOST_RATE_LIMITS[host]
+            bucket = TokenBucket(rate=float(rate), burst=max(int(burst), 1))
+            self.buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str):
+        """请求前调用，按目标主机限速"""
+        await self._bucket(url).acquire()
+
+    def pause(self, url: str, seconds: float):
+        """目标主机限流时暂停后续请求"""
+        logger.debug(f"Pausing {urlparse(url).netloc} for {seconds:.1f}s")
+        self._bucket(url).pause(seconds)
+
+
+_rate_limiter: Optional[HostRateLimiter] = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """获取进程内共享的限速器"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter()
+    return _rate_limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头，支持秒数和HTTP日期两种格式"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def compute_backoff(attempt: int, base: Optional[float] = None, cap: Optional[float] = None) -> float:
+    """
+    带抖动的指数退避（full jitter）
+    :param attempt: 已失败次数，从0开始
+    :param base: 基础等待时间，默认 SCRAPER_DELAY
+    :param cap: 最大等待时间，默认 SCRAPER_BACKOFF_MAX
+    """
+    base = settings.SCRAPER_DELAY if base is None else base
+    cap = settings.SCRAPER_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))